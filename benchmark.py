@@ -0,0 +1,825 @@
+# benchmark.py
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cn2an import (
+    CHINESE_NUM_MAP,
+    Converter,
+    NumeralTable,
+    arabic_to_chinese,
+    arabic_to_chinese_many,
+    chinese_to_arabic,
+    chinese_to_arabic_many,
+    convert_file,
+    convert_text,
+    find_numerals,
+    perform_conversions,
+    preview_conversions,
+    scan_file_mmap,
+)
+
+
+def _legacy_chinese_to_arabic(chinese_num: str) -> int:
+    """
+    1.2.0版本的chinese_to_arabic实现，作为性能对比基准
+    （每次调用重建映射表，并单独进行一次校验）
+    """
+    if not chinese_num:
+        raise ValueError("中文数字字符串不能为空")
+    invalid_chars = [c for c in chinese_num if c not in CHINESE_NUM_MAP]
+    if invalid_chars:
+        raise ValueError(f"包含无效的中文数字字符: {', '.join(invalid_chars)}")
+    if chinese_num == "十":
+        return 10
+    unit_map = {"十": 10, "百": 100, "千": 1000, "万": 10000, "亿": 100000000}
+    num_map = {
+        "一": 1,
+        "二": 2,
+        "三": 3,
+        "四": 4,
+        "五": 5,
+        "六": 6,
+        "七": 7,
+        "八": 8,
+        "九": 9,
+    }
+    result = 0
+    current_section = 0
+    temp_value = 0
+    for char in chinese_num:
+        if char in num_map:
+            temp_value = temp_value * 10 + num_map[char]
+        elif char == "零":
+            current_section += temp_value
+            temp_value = 0
+        elif char in unit_map:
+            unit_val = unit_map[char]
+            if temp_value == 0:
+                temp_value = 1
+            if unit_val >= 10000:
+                current_section += temp_value
+                result += current_section * unit_val
+                current_section = 0
+            else:
+                current_section += temp_value * unit_val
+            temp_value = 0
+    current_section += temp_value
+    result += current_section
+    return result
+
+
+_PREVIOUS_DIGITS = {"零": 0, "一": 1, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+_PREVIOUS_UNITS = {"十": 10, "百": 100, "千": 1000, "万": 10000, "亿": 100000000}
+
+
+class _PreviousConverter:
+    """
+    扩展语法之前的Converter（原样保留，只支持零到九和十百千万亿），
+    作为扩展语法的性能对比基准
+    """
+
+    __slots__ = ("_digits", "_units")
+
+    def __init__(self) -> None:
+        self._digits = _PREVIOUS_DIGITS
+        self._units = _PREVIOUS_UNITS
+
+    def convert(self, chinese_num: str) -> int:
+        if not chinese_num:
+            raise ValueError("中文数字字符串不能为空")
+
+        digits = self._digits
+        units = self._units
+        result = 0
+        current_section = 0  # 当前小节（万以下部分）
+        temp_value = 0  # 当前临时值
+
+        for char in chinese_num:
+            digit = digits.get(char)
+            if digit is not None:
+                if digit:
+                    temp_value = temp_value * 10 + digit
+                else:
+                    # 处理零
+                    current_section += temp_value
+                    temp_value = 0
+                continue
+
+            unit_val = units.get(char)
+            if unit_val is None:
+                raise self._invalid(chinese_num)
+
+            if unit_val >= 10000:
+                # 高级单位（万和亿）作用于整个小节，小节为空时默认为1
+                current_section += temp_value
+                result += (current_section or 1) * unit_val
+                current_section = 0
+            else:
+                # 低级单位（十、百、千），没有前置数字时默认为1（如"十"表示10）
+                current_section += (temp_value or 1) * unit_val
+            temp_value = 0
+
+        return result + current_section + temp_value
+
+    def _invalid(self, chinese_num: str) -> ValueError:
+        invalid_chars = [
+            c for c in chinese_num if c not in self._digits and c not in self._units
+        ]
+        return ValueError(f"包含无效的中文数字字符: {', '.join(invalid_chars)}")
+
+
+# 小写数字到大写（财务）数字的替换表
+_FINANCIAL = str.maketrans("一二三四五六七八九十百千万亿", "壹贰叁肆伍陆柒捌玖拾佰仟萬億")
+
+
+def make_extended_numerals(count: int, limit: int = 100000, seed: int = 0) -> List[str]:
+    """
+    生成使用扩展语法的随机中文数字样本（大写数字、两、〇、负数、小数、万亿）
+    :param count: 样本数量
+    :param limit: 整数部分的数值上限（不含）
+    :param seed: 随机种子
+    :return: 中文数字字符串列表
+    """
+    rng = random.Random(seed)
+    numerals = []
+    for _ in range(count):
+        value = rng.randrange(1, limit)
+        text = arabic_to_chinese(value)
+        kind = rng.randrange(6)
+        if kind == 0:
+            text = text.translate(_FINANCIAL)
+        elif kind == 1:
+            text = text.replace("二千", "两千").replace("二万", "两万")
+        elif kind == 2:
+            text = "负" + text
+        elif kind == 3:
+            text = text + "点" + "".join(rng.choice("〇一二三四五六七八九") for _ in range(2))
+        elif kind == 4:
+            text = arabic_to_chinese(value % 10000 or 1) + "万亿"
+        numerals.append(text)
+    return numerals
+
+
+def make_numerals(count: int, limit: int = 100000, seed: int = 0) -> List[str]:
+    """
+    生成随机中文数字样本
+    :param count: 样本数量
+    :param limit: 数值上限（不含）
+    :param seed: 随机种子，保证结果可复现
+    :return: 中文数字字符串列表
+    """
+    rng = random.Random(seed)
+    return [arabic_to_chinese(rng.randrange(1, limit)) for _ in range(count)]
+
+
+def _time_best(func: Callable[[], object], repeat: int) -> float:
+    """多次运行并返回最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_converter(count: int, repeat: int = 3) -> Dict[str, float]:
+    """
+    对比旧实现与预编译转换器的单次调用耗时
+    :param count: 每轮转换的中文数字数量
+    :param repeat: 重复轮数
+    :return: 各实现每秒转换次数及加速比
+    """
+    numerals = make_numerals(count)
+    converter = Converter()
+    convert = converter.convert
+
+    def run(func: Callable[[str], int]) -> Callable[[], None]:
+        def loop() -> None:
+            for text in numerals:
+                func(text)
+
+        return loop
+
+    legacy = _time_best(run(_legacy_chinese_to_arabic), repeat)
+    compiled = _time_best(run(convert), repeat)
+    public = _time_best(run(chinese_to_arabic), repeat)
+    return {
+        "count": count,
+        "legacy_per_sec": count / legacy,
+        "converter_per_sec": count / compiled,
+        "chinese_to_arabic_per_sec": count / public,
+        "speedup": legacy / compiled,
+    }
+
+
+def bench_grammar(count: int, repeat: int = 3) -> Dict[str, float]:
+    """
+    对比扩展语法前后的Converter吞吐量，并测量扩展语法样本的吞吐量
+    :param count: 每轮转换的中文数字数量
+    :param repeat: 重复轮数
+    :return: 各转换器每秒转换次数，ratio为当前转换器相对之前转换器的速度（>=1表示没有损失）
+    """
+    numerals = make_numerals(count)
+    extended = make_extended_numerals(count)
+    previous_convert = _PreviousConverter().convert
+    convert = Converter().convert
+
+    def run(func: Callable[[str], object], samples: List[str]) -> Callable[[], None]:
+        def loop() -> None:
+            for text in samples:
+                func(text)
+
+        return loop
+
+    # 两个转换器交替运行，减少机器负载波动对比例的影响
+    previous = current = float("inf")
+    for _ in range(repeat):
+        previous = min(previous, _time_best(run(previous_convert, numerals), 1))
+        current = min(current, _time_best(run(convert, numerals), 1))
+    current_extended = _time_best(run(convert, extended), repeat)
+    return {
+        "count": count,
+        "previous_converter_per_sec": count / previous,
+        "converter_per_sec": count / current,
+        "converter_extended_per_sec": count / current_extended,
+        "ratio": previous / current,
+    }
+
+
+def bench_batch(count: int, limit: int = 1000, repeat: int = 3) -> Dict[str, float]:
+    """
+    对比逐个调用chinese_to_arabic与批量接口的吞吐量
+    :param count: 每轮转换的中文数字数量
+    :param limit: 数值上限，越小重复率越高
+    :param repeat: 重复轮数
+    :return: 各方式每秒转换次数及加速比
+    """
+    numerals = make_numerals(count, limit)
+
+    def loop() -> None:
+        for text in numerals:
+            chinese_to_arabic(text)
+
+    plain = _time_best(loop, repeat)
+    as_list = _time_best(lambda: chinese_to_arabic_many(numerals), repeat)
+    as_array = _time_best(
+        lambda: chinese_to_arabic_many(numerals, as_array=True), repeat
+    )
+    return {
+        "count": count,
+        "unique": len(set(numerals)),
+        "loop_per_sec": count / plain,
+        "many_list_per_sec": count / as_list,
+        "many_array_per_sec": count / as_array,
+        "speedup": plain / as_list,
+    }
+
+
+def bench_table(
+    sizes: List[int], count: int, repeat: int = 3, tmpdir: Optional[str] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    测量不同大小的数字查找表的构建耗时、加载耗时、文件大小、内存占用和查找吞吐量
+    样本均取自表的范围之内，与逐字解析的吞吐量对比
+    :param sizes: 查找表大小列表（如 10000 100000 1000000）
+    :param count: 每轮查找的中文数字数量
+    :param repeat: 重复轮数
+    :param tmpdir: 存放查找表文件的目录
+    :return: 按表大小分组的测量结果
+    """
+    import tempfile
+
+    convert = Converter().convert
+    results = {}
+    for size in sizes:
+        numerals = make_numerals(count, size)
+        table = NumeralTable(size - 1)
+        start = time.perf_counter()
+        len(table)
+        build = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory(prefix="cn2an-bench-", dir=tmpdir) as root:
+            path = os.path.join(root, "table.bin")
+            table.save(path)
+            file_bytes = os.path.getsize(path)
+            del table
+            start = time.perf_counter()
+            table = NumeralTable.load(path)
+            load = time.perf_counter() - start
+            # 内存单独测量，避免tracemalloc的开销计入耗时
+            table_bytes = _measure_retained(lambda: NumeralTable.load(path))
+
+        def run(func: Callable[[str], object]) -> Callable[[], None]:
+            def loop() -> None:
+                for text in numerals:
+                    func(text)
+
+            return loop
+
+        lookup = _time_best(run(table.convert), repeat)
+        parse = _time_best(run(convert), repeat)
+        results[str(size)] = {
+            "build_sec": build,
+            "load_sec": load,
+            "file_bytes": file_bytes,
+            "table_bytes": table_bytes,
+            "lookup_per_sec": count / lookup,
+            "parser_per_sec": count / parse,
+            "speedup": parse / lookup,
+        }
+        del table
+    return results
+
+
+def make_text(size_mb: float, seed: int = 0) -> str:
+    """
+    生成夹杂中文数字的合成文本（如章节列表、字幕）
+    :param size_mb: 目标大小（UTF-8编码后的MB数，近似值）
+    :param seed: 随机种子
+    :return: 文本
+    """
+    rng = random.Random(seed)
+    fillers = ["章 风起云涌\n", "集 Episode ", "，他们走了", "天后再见。\n", " - subtitle line "]
+    numerals = make_numerals(2000, limit=100000, seed=seed)
+    pieces = []
+    size = 0
+    target = int(size_mb * 1024 * 1024)
+    while size < target:
+        piece = "第" + rng.choice(numerals) + rng.choice(fillers)
+        pieces.append(piece)
+        size += len(piece.encode("utf-8"))
+    return "".join(pieces)
+
+
+def bench_text(size_mb: float, repeat: int = 3) -> Dict[str, float]:
+    """
+    测量全文中文数字扫描和替换的吞吐量
+    :param size_mb: 测试文本大小（MB）
+    :param repeat: 重复轮数
+    :return: 扫描、替换及mmap字节扫描的MB/s和中文数字数量
+    """
+    import tempfile
+
+    text = make_text(size_mb)
+    data = text.encode("utf-8")
+    megabytes = len(data) / (1024 * 1024)
+    spans = find_numerals(text)
+    find = _time_best(lambda: find_numerals(text), repeat)
+    convert = _time_best(lambda: convert_text(text), repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "text.txt")
+        with open(path, "wb") as f:
+            f.write(data)
+        mapped = _time_best(lambda: sum(1 for _ in scan_file_mmap(path)), repeat)
+    return {
+        "size_mb": megabytes,
+        "numerals": len(spans),
+        "find_mb_per_sec": megabytes / find,
+        "convert_mb_per_sec": megabytes / convert,
+        "mmap_scan_mb_per_sec": megabytes / mapped,
+    }
+
+
+def bench_parallel(
+    size_mb: float, jobs_list: List[int], chunk_size: int = 1 << 20, repeat: int = 3
+) -> Dict[str, object]:
+    """
+    测量不同进程数下文本文件转换的吞吐量
+    :param size_mb: 测试文件大小（MB）
+    :param jobs_list: 要测量的进程数列表
+    :param chunk_size: 每个分片读取的字符数
+    :param repeat: 重复轮数
+    :return: 各进程数对应的MB/s及相对单进程的加速比
+    """
+    import tempfile
+
+    data = make_text(size_mb).encode("utf-8")
+    megabytes = len(data) / (1024 * 1024)
+    throughput = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "input.txt")
+        target = os.path.join(tmp, "output.txt")
+        with open(source, "wb") as f:
+            f.write(data)
+        for jobs in jobs_list:
+            elapsed = _time_best(
+                lambda: convert_file(source, target, chunk_size=chunk_size, jobs=jobs),
+                repeat,
+            )
+            throughput[str(jobs)] = megabytes / elapsed
+    baseline = throughput.get("1")
+    speedup = (
+        {jobs: value / baseline for jobs, value in throughput.items()} if baseline else {}
+    )
+    return {
+        "size_mb": megabytes,
+        "cpu_count": os.cpu_count(),
+        "mb_per_sec": throughput,
+        "speedup": speedup,
+    }
+
+
+def bench_roundtrip(
+    count: int, limit: int = 10**12, seed: int = 0, repeat: int = 3
+) -> Dict[str, float]:
+    """
+    测量arabic_to_chinese与chinese_to_arabic的吞吐量（正确性由tests/test_roundtrip.py验证）
+    样本在[0, limit)内按数量级均匀抽样
+    :param count: 样本数量
+    :param limit: 抽样上限（不含）
+    :param seed: 随机种子
+    :param repeat: 重复轮数
+    :return: 每秒格式化和解析次数
+    """
+    rng = random.Random(seed)
+    digits = len(str(limit - 1))
+    # 先随机选位数再随机取值，保证大数和小数都能被覆盖
+    numbers = [
+        rng.randrange(10 ** rng.randrange(1, digits + 1)) % limit for _ in range(count)
+    ]
+    texts = arabic_to_chinese_many(numbers).values
+
+    def parse() -> None:
+        for text in texts:
+            chinese_to_arabic(text)
+
+    format_time = _time_best(lambda: arabic_to_chinese_many(numbers), repeat)
+    parse_time = _time_best(parse, repeat)
+    return {
+        "count": count,
+        "limit": limit,
+        "format_per_sec": count / format_time,
+        "parse_per_sec": count / parse_time,
+    }
+
+
+def default_tmpdir() -> Optional[str]:
+    """优先使用tmpfs（/dev/shm）生成测试目录，避免磁盘IO干扰结果"""
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+def make_tree(root: str, files: int, per_dir: int = 1000, seed: int = 0) -> int:
+    """
+    生成合成目录树：每个子目录最多per_dir个文件，约90%的文件名包含"第X集"
+    :param root: 根目录
+    :param files: 文件总数
+    :param per_dir: 每个目录的文件数
+    :param seed: 随机种子
+    :return: 文件名可转换的文件数量
+    """
+    rng = random.Random(seed)
+    matched = 0
+    directory = root
+    for n in range(files):
+        if not n % per_dir:
+            directory = os.path.join(root, f"d{n // per_dir:05d}")
+            os.mkdir(directory)
+        if rng.randrange(10):
+            name = f"第{arabic_to_chinese(n % per_dir + 1)}集-{n}.txt"
+            matched += 1
+        else:
+            name = f"file-{n}.txt"
+        with open(os.path.join(directory, name), "w"):
+            pass
+    return matched
+
+
+def _measure_peak(func: Callable[[], object]) -> Tuple[object, int]:
+    """
+    在tracemalloc下运行函数
+    :return: (函数返回值, Python分配的峰值内存字节数)
+    """
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def _measure_retained(func: Callable[[], object]) -> int:
+    """
+    在tracemalloc下运行函数
+    :return: 函数返回值仍被引用时占用的Python内存字节数
+    """
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        result = func()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current
+
+
+def bench_tree(files: int, tmpdir: Optional[str] = None) -> Dict[str, float]:
+    """
+    在合成目录树上测量扫描预览和重命名的吞吐量及峰值内存
+    耗时与内存分两轮测量，避免tracemalloc的开销计入耗时；
+    内存轮使用反向规则把文件名改回中文数字，同时验证双向转换
+    :param files: 文件数量
+    :param tmpdir: 生成目录树的父目录，默认优先使用tmpfs
+    :return: 扫描条目/秒、重命名/秒及峰值内存（字节）
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="cn2an-bench-", dir=tmpdir) as root:
+        start = time.perf_counter()
+        expected = make_tree(root, files)
+        setup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        conversions = preview_conversions(root, recursive=True)
+        scan = time.perf_counter() - start
+        _, scan_peak = _measure_peak(lambda: preview_conversions(root, recursive=True))
+
+        start = time.perf_counter()
+        renamed = perform_conversions(conversions)
+        rename = time.perf_counter() - start
+        del conversions
+
+        reverse = preview_conversions(
+            root, r"{an_num}集-", r"第{cn_num}集-", recursive=True, reverse=True
+        )
+        restored, rename_peak = _measure_peak(lambda: perform_conversions(reverse))
+
+    return {
+        "files": files,
+        "matched": expected,
+        "renamed": renamed,
+        "restored": restored,
+        "setup_sec": setup,
+        "scan_entries_per_sec": files / scan,
+        "renames_per_sec": renamed / rename if rename else 0.0,
+        "scan_peak_bytes": scan_peak,
+        "rename_peak_bytes": rename_peak,
+    }
+
+
+def run_suite(
+    sizes: List[int], conversions: int, tmpdir: Optional[str] = None
+) -> Dict[str, object]:
+    """
+    运行完整的基准测试套件
+    :param sizes: 合成目录树的文件数量列表
+    :param conversions: 转换基准的中文数字数量
+    :param tmpdir: 生成目录树的父目录
+    :return: 可序列化为JSON的测试结果
+    """
+    import platform
+
+    numerals = make_numerals(conversions)
+
+    def loop() -> None:
+        for text in numerals:
+            chinese_to_arabic(text)
+
+    elapsed = _time_best(loop, 3)
+    _, convert_peak = _measure_peak(lambda: chinese_to_arabic_many(numerals))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "conversion": {
+            "count": conversions,
+            "conversions_per_sec": conversions / elapsed,
+            "batch_peak_bytes": convert_peak,
+        },
+        "trees": {str(size): bench_tree(size, tmpdir) for size in sizes},
+    }
+
+
+def _flatten(result: Dict[str, object], prefix: str = "") -> Dict[str, float]:
+    """将嵌套的测试结果展开为"a.b.c"形式的键"""
+    flat = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare_results(
+    current: Dict[str, object], baseline: Dict[str, object], threshold: float
+) -> List[str]:
+    """
+    与基线结果比较，找出超过阈值的性能退化
+    以"_per_sec"结尾的指标越大越好，以"_bytes"和"_ms"结尾的指标越小越好，其余指标不参与比较
+    :param current: 本次结果
+    :param baseline: 基线结果
+    :param threshold: 允许的相对退化比例（如0.1表示10%）
+    :return: 退化描述列表，为空表示没有退化
+    """
+    regressions = []
+    now = _flatten(current)
+    for key, before in _flatten(baseline).items():
+        after = now.get(key)
+        if after is None or not before:
+            continue
+        if key.endswith("_per_sec"):
+            change = (before - after) / before
+        elif key.endswith(("_bytes", "_ms")):
+            change = (after - before) / before
+        else:
+            continue
+        if change > threshold:
+            regressions.append(f"{key}: {before:.6g} -> {after:.6g}（退化 {change:.1%}）")
+    return regressions
+
+
+def measure_import_time(module: str, repeat: int = 5) -> Tuple[float, float]:
+    """
+    使用python -X importtime测量模块冷启动导入耗时
+    :param module: 模块名
+    :param repeat: 重复次数，取最小值
+    :return: (模块自身的导入耗时, 模块自身及其依赖的累计导入耗时)，单位毫秒
+    """
+    env = dict(os.environ)
+    # 允许写入字节码缓存，避免把源码编译时间计入导入耗时
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    # 预热一次以生成字节码缓存
+    subprocess.run(command, env=env, cwd=cwd, capture_output=True, check=True)
+
+    best_self = best = float("inf")
+    for _ in range(repeat):
+        result = subprocess.run(
+            command, env=env, cwd=cwd, capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            # 格式: "import time: self [us] | cumulative | imported package"
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].rstrip() == f" {module}":
+                best_self = min(best_self, int(parts[0].rsplit(None, 1)[1]) / 1000)
+                best = min(best, int(parts[1]) / 1000)
+    return best_self, best
+
+
+def bench_importtime(modules: List[str], repeat: int = 5) -> Dict[str, float]:
+    """
+    测量各模块的导入耗时
+    :param modules: 模块名列表
+    :param repeat: 重复次数
+    :return: 各模块自身（*_self_import_ms）及累计（*_import_ms）的导入耗时（毫秒）
+    """
+    result = {}
+    for module in modules:
+        own, total = measure_import_time(module, repeat)
+        result[f"{module}_self_import_ms"] = own
+        result[f"{module}_import_ms"] = total
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="cn2an 性能基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    converter_parser = subparsers.add_parser("converter", help="中文数字转换微基准")
+    converter_parser.add_argument("--count", type=int, default=1000000, help="转换数量")
+    converter_parser.add_argument("--repeat", type=int, default=3, help="重复轮数")
+
+    grammar_parser = subparsers.add_parser("grammar", help="扩展语法转换循环基准")
+    grammar_parser.add_argument("--count", type=int, default=1000000, help="转换数量")
+    grammar_parser.add_argument("--repeat", type=int, default=3, help="重复轮数")
+
+    batch_parser = subparsers.add_parser("batch", help="批量转换接口基准")
+    batch_parser.add_argument("--count", type=int, default=1000000, help="转换数量")
+    batch_parser.add_argument("--limit", type=int, default=1000, help="数值上限")
+    batch_parser.add_argument("--repeat", type=int, default=3, help="重复轮数")
+
+    table_parser = subparsers.add_parser("table", help="数字查找表的内存占用和查找吞吐量基准")
+    table_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10**4, 10**5, 10**6],
+        help="查找表大小",
+    )
+    table_parser.add_argument("--count", type=int, default=1000000, help="查找数量")
+    table_parser.add_argument("--repeat", type=int, default=3, help="重复轮数")
+    table_parser.add_argument(
+        "--tmpdir", default=default_tmpdir(), help="存放查找表文件的目录，默认优先使用/dev/shm"
+    )
+
+    text_parser = subparsers.add_parser("text", help="全文中文数字扫描基准")
+    text_parser.add_argument("--size-mb", type=float, default=8, help="测试文本大小（MB）")
+    text_parser.add_argument("--repeat", type=int, default=3, help="重复轮数")
+
+    parallel_parser = subparsers.add_parser("parallel", help="多进程文本转换吞吐量基准")
+    parallel_parser.add_argument("--size-mb", type=float, default=64, help="测试文件大小（MB）")
+    parallel_parser.add_argument(
+        "--jobs", type=int, nargs="+", default=[1, 2, 4, 8], help="要测量的进程数"
+    )
+    parallel_parser.add_argument(
+        "--chunk-size", type=int, default=1 << 20, help="每个分片读取的字符数"
+    )
+    parallel_parser.add_argument("--repeat", type=int, default=3, help="重复轮数")
+
+    roundtrip_parser = subparsers.add_parser(
+        "roundtrip", help="中文数字与阿拉伯数字双向转换的吞吐量基准"
+    )
+    roundtrip_parser.add_argument("--count", type=int, default=1000000, help="抽样数量")
+    roundtrip_parser.add_argument("--limit", type=int, default=10**12, help="抽样上限")
+    roundtrip_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    roundtrip_parser.add_argument("--repeat", type=int, default=3, help="重复轮数")
+
+    suite_parser = subparsers.add_parser(
+        "suite", help="完整基准测试：转换、目录扫描、重命名吞吐量及峰值内存"
+    )
+    suite_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 100000],
+        help="合成目录树的文件数量（如 1000 100000 1000000）",
+    )
+    suite_parser.add_argument(
+        "--conversions", type=int, default=1000000, help="转换基准的中文数字数量"
+    )
+    suite_parser.add_argument(
+        "--tmpdir", default=default_tmpdir(), help="生成目录树的父目录，默认优先使用/dev/shm"
+    )
+    suite_parser.add_argument("--output", default=None, help="将结果写入该JSON文件")
+    suite_parser.add_argument("--baseline", default=None, help="用于比较的基线JSON文件")
+    suite_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="允许的相对退化比例，超过时返回非0退出码"
+    )
+
+    import_parser = subparsers.add_parser("importtime", help="模块导入耗时基准")
+    import_parser.add_argument(
+        "--modules", nargs="+", default=["cn2an", "gui"], help="要测量的模块"
+    )
+    import_parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    import_parser.add_argument(
+        "--max-ms", type=float, default=None, help="任一模块导入超过该耗时（毫秒）时返回非0退出码"
+    )
+    import_parser.add_argument("--output", default=None, help="将结果写入该JSON文件")
+    import_parser.add_argument("--baseline", default=None, help="用于比较的基线JSON文件")
+    import_parser.add_argument(
+        "--threshold", type=float, default=0.5, help="允许的相对退化比例，超过时返回非0退出码"
+    )
+
+    args = parser.parse_args()
+    if args.command == "converter":
+        result = bench_converter(args.count, args.repeat)
+    elif args.command == "grammar":
+        result = bench_grammar(args.count, args.repeat)
+    elif args.command == "batch":
+        result = bench_batch(args.count, args.limit, args.repeat)
+    elif args.command == "table":
+        result = bench_table(args.sizes, args.count, args.repeat, args.tmpdir)
+    elif args.command == "text":
+        result = bench_text(args.size_mb, args.repeat)
+    elif args.command == "parallel":
+        result = bench_parallel(args.size_mb, args.jobs, args.chunk_size, args.repeat)
+    elif args.command == "roundtrip":
+        result = bench_roundtrip(args.count, args.limit, args.seed, args.repeat)
+    elif args.command == "suite":
+        result = run_suite(args.sizes, args.conversions, args.tmpdir)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+            result["regressions"] = compare_results(result, baseline, args.threshold)
+            if result["regressions"]:
+                print(json.dumps(result, ensure_ascii=False, indent=2))
+                sys.exit(f"性能退化超过阈值 {args.threshold:.0%}")
+    elif args.command == "importtime":
+        result = bench_importtime(args.modules, args.repeat)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+        if args.max_ms is not None and max(result.values()) > args.max_ms:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+            sys.exit(f"导入耗时超过阈值 {args.max_ms} 毫秒")
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+            regressions = compare_results(result, baseline, args.threshold)
+            if regressions:
+                result["regressions"] = regressions
+                print(json.dumps(result, ensure_ascii=False, indent=2))
+                sys.exit(f"导入耗时退化超过阈值 {args.threshold:.0%}")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
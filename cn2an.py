@@ -1,17 +1,38 @@
+# 为缩短命令行和GUI的启动时间，json、array、concurrent.futures、sqlite3
+# 以及config等只在实际使用时才导入
 import os
 import re
+import fnmatch
+import functools
 import logging
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, NoReturn, List, Tuple
-
-# 从config导入版本信息
-from config import __version__
+from typing import (
+    IO,
+    AsyncIterator,
+    Dict,
+    Optional,
+    NoReturn,
+    List,
+    Tuple,
+    Iterator,
+    Iterable,
+    NamedTuple,
+    Sequence,
+    Union,
+    Callable,
+)
 
 # 中文数字到阿拉伯数字的映射常量
+# 包括小写数字、"两"、"〇"、大写（财务）数字及繁体单位，"兆"按万亿（10^12）计
 CHINESE_NUM_MAP: Dict[str, int] = {
     "零": 0,
+    "〇": 0,
     "一": 1,
     "二": 2,
+    "两": 2,
     "三": 3,
     "四": 4,
     "五": 5,
@@ -19,15 +40,116 @@ CHINESE_NUM_MAP: Dict[str, int] = {
     "七": 7,
     "八": 8,
     "九": 9,
+    "壹": 1,
+    "贰": 2,
+    "叁": 3,
+    "肆": 4,
+    "伍": 5,
+    "陆": 6,
+    "柒": 7,
+    "捌": 8,
+    "玖": 9,
     "十": 10,
+    "拾": 10,
     "百": 100,
+    "佰": 100,
     "千": 1000,
+    "仟": 1000,
     "万": 10000,
+    "萬": 10000,
     "亿": 100000000,
+    "億": 100000000,
+    "兆": 1000000000000,
 }
 
-# 中文数字匹配模式（预编译提升性能）
-CHINESE_NUM_PATTERN = re.compile(r"第([一二三四五六七八九十百千万亿零]+)")
+# 负号与小数点，只能分别出现在开头和整数部分之后
+NEGATIVE_SIGN = "负"
+DECIMAL_POINT = "点"
+
+# 中文数字字符类（由CHINESE_NUM_MAP派生）
+_NUMERAL_CLASS = "[" + "".join(CHINESE_NUM_MAP) + "]"
+_DIGIT_CLASS = "[" + "".join(c for c, v in CHINESE_NUM_MAP.items() if v < 10) + "]"
+
+# 完整的中文数字：可选负号、整数部分、可选的小数部分（小数点后只能是数字）
+_NUMERAL_REGEX = rf"{NEGATIVE_SIGN}?{_NUMERAL_CLASS}+(?:{DECIMAL_POINT}{_DIGIT_CLASS}+)?"
+
+# 匹配模式中{cn_num}占位符对应的正则表达式
+CN_NUM_REGEX = rf"({_NUMERAL_REGEX})"
+
+# 反向转换时匹配模式中{an_num}占位符对应的正则表达式
+AN_NUM_REGEX = r"(\d+)"
+
+# 本模块的正则表达式都在首次使用时才编译，避免拖慢导入
+def __getattr__(name: str):
+    """按需编译模块级常量CHINESE_NUM_PATTERN（"第"加中文数字）"""
+    if name == "CHINESE_NUM_PATTERN":
+        pattern = globals()[name] = re.compile(rf"第({_NUMERAL_REGEX})")
+        return pattern
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _numeral_run_pattern(require_prefix: bool) -> "re.Pattern[str]":
+    """全文扫描模式：单次线性扫描找出所有连续的中文数字，可选要求前缀"第"（不含在匹配中）"""
+    if require_prefix:
+        return re.compile(rf"(?<=第){_NUMERAL_REGEX}")
+    return re.compile(_NUMERAL_REGEX)
+
+
+def _utf8_alternation(chars: Iterable[str]) -> bytes:
+    """按UTF-8编码的前缀分组构造字节正则，末字节合并为字符类以减少回溯"""
+    groups: Dict[bytes, List[int]] = OrderedDict()
+    for char in chars:
+        encoded = char.encode("utf-8")
+        groups.setdefault(encoded[:-1], []).append(encoded[-1])
+    return b"(?:" + b"|".join(
+        re.escape(prefix) + b"[" + b"".join(re.escape(bytes([b])) for b in tails) + b"]"
+        for prefix, tails in groups.items()
+    ) + b")"
+
+
+@functools.lru_cache(maxsize=None)
+def _numeral_bytes_pattern(require_prefix: bool) -> "re.Pattern[bytes]":
+    """
+    字节级扫描模式：直接匹配中文数字字符的UTF-8编码，无需解码整个文件
+    （UTF-8的首字节不会出现在后续字节位置，因此匹配结果总是对齐到字符边界）
+    """
+    regex = (
+        b"(?:"
+        + re.escape(NEGATIVE_SIGN.encode("utf-8"))
+        + b")?"
+        + _utf8_alternation(CHINESE_NUM_MAP)
+        + b"+(?:"
+        + re.escape(DECIMAL_POINT.encode("utf-8"))
+        + _utf8_alternation(c for c, v in CHINESE_NUM_MAP.items() if v < 10)
+        + b"+)?"
+    )
+    if require_prefix:
+        regex = b"(?<=" + re.escape("第".encode("utf-8")) + b")" + regex
+    return re.compile(regex)
+
+# 取消检查间隔：扫描单个目录时每处理多少个条目检查一次取消标志
+CANCEL_CHECK_INTERVAL = 1024
+# 预览进度回调间隔（文件数）
+PROGRESS_INTERVAL = 256
+
+# 递归扫描时的默认并发线程数（目录扫描以IO为主）
+DEFAULT_SCAN_WORKERS: int = min(8, (os.cpu_count() or 1) + 4)
+
+# 逐文件日志的结果标记（logging的extra参数），汇总模式下按结果计数而不逐行输出
+_LOG_RENAMED = {"outcome": "renamed"}
+_LOG_FAILED = {"outcome": "failed"}
+_LOG_UNCHANGED = {"outcome": "unchanged"}
+_LOG_UNMATCHED = {"outcome": "unmatched"}
+_LOG_UNDONE = {"outcome": "undone"}
+
+
+# 有效字符集合：中文数字字符及负号、小数点
+_VALID_CHARS = frozenset(CHINESE_NUM_MAP) | {NEGATIVE_SIGN, DECIMAL_POINT}
+
+# 负号和小数点在查找表中的取值，大于所有单位，只在罕见的大单位分支中判断
+_NEGATIVE_CODE = 1 << 100
+_POINT_CODE = 1 << 101
 
 
 def validate_chinese_number(chinese_num: str) -> None:
@@ -36,266 +158,3288 @@ def validate_chinese_number(chinese_num: str) -> None:
     :param chinese_num: 中文数字字符串
     :raises ValueError: 如果包含无效字符
     """
-    invalid_chars = [c for c in chinese_num if c not in CHINESE_NUM_MAP]
-    if invalid_chars:
-        raise ValueError(f"包含无效的中文数字字符: {', '.join(invalid_chars)}")
+    if _VALID_CHARS.issuperset(chinese_num):
+        return
+    invalid_chars = [c for c in chinese_num if c not in _VALID_CHARS]
+    raise ValueError(f"包含无效的中文数字字符: {', '.join(invalid_chars)}")
 
 
-def chinese_to_arabic(chinese_num: str) -> int:
-    if not chinese_num:
-        raise ValueError("中文数字字符串不能为空")
+class Converter:
     """
-    将中文数字转换为阿拉伯数字
-    :param chinese_num: 中文数字字符串（如'一', '十', '一百二十三', '十亿'）
-    :return: 对应的阿拉伯数字
-    :raises ValueError: 如果包含无效字符
+    预编译的表驱动中文数字转换器
+
+    构造时生成一张字符到数值的查找表，字符的类别由数值区间决定：
+    小于10为数字，10到9999为小单位（十百千），不小于10000为大单位（万亿兆），
+    负号和小数点使用大于所有单位的特殊值。
+    转换时单次遍历字符串，每个字符只查一次表，同时完成字符校验和数值计算。
     """
-    # 验证输入
-    validate_chinese_number(chinese_num)
-
-    # 处理特殊情况：单独的"十"表示10
-    if chinese_num == "十":
-        return 10
-
-    # 中文数字转换核心算法
-    # 定义单位值映射
-    unit_map = {"十": 10, "百": 100, "千": 1000, "万": 10000, "亿": 100000000}
-    # 基础数字值映射
-    num_map = {
-        "一": 1,
-        "二": 2,
-        "三": 3,
-        "四": 4,
-        "五": 5,
-        "六": 6,
-        "七": 7,
-        "八": 8,
-        "九": 9,
-    }
 
-    # 初始化变量
-    result = 0
-    current_section = 0  # 当前小节（个级）
-    temp_value = 0  # 当前临时值
-
-    for char in chinese_num:
-        if char in num_map:
-            # 当前字符是数字
-            temp_value = temp_value * 10 + num_map[char]
-        elif char == "零":
-            # 处理零
-            current_section += temp_value
-            temp_value = 0
-        elif char in unit_map:
-            # 当前字符是单位
-            unit_val = unit_map[char]
-
-            # 如果没有前置数字，默认为1（如"十"表示10）
-            if temp_value == 0:
-                temp_value = 1
-
-            # 处理高级单位（万和亿）
-            if unit_val >= 10000:
-                # 先将临时值加到当前小节
-                current_section += temp_value
-                # 将当前小节乘以高级单位并加到结果
-                result += current_section * unit_val
-                # 重置当前小节
-                current_section = 0
+    __slots__ = ("_table", "_fraction_digits")
+
+    def __init__(self, num_map: Optional[Dict[str, int]] = None) -> None:
+        """
+        :param num_map: 字符到数值的映射，默认使用CHINESE_NUM_MAP
+        """
+        if num_map is None:
+            num_map = CHINESE_NUM_MAP
+        self._table = dict(num_map)
+        self._table[NEGATIVE_SIGN] = _NEGATIVE_CODE
+        self._table[DECIMAL_POINT] = _POINT_CODE
+        # 小数部分只含数字，直接逐字符翻译为ASCII数字
+        self._fraction_digits = str.maketrans(
+            {c: str(v) for c, v in num_map.items() if v < 10}
+        )
+
+    def convert(self, chinese_num: str) -> Union[int, float]:
+        """
+        将中文数字转换为阿拉伯数字
+        :param chinese_num: 中文数字字符串（如'一百二十三', '两万', '壹佰', '三万亿', '负五', '三点一四'）
+        :return: 对应的阿拉伯数字，包含小数点时为float
+        :raises ValueError: 如果字符串为空、包含无效字符或格式错误
+        """
+        if not chinese_num:
+            raise ValueError("中文数字字符串不能为空")
+
+        table = self._table
+        result = 0
+        section = 0  # 当前小节（大单位以下部分）
+        temp = 0  # 当前临时值
+        terms = []  # 已乘以大单位的各项：(数值, 量级)
+        negative = False
+        fraction_part = None
+
+        for char in chinese_num:
+            value = table.get(char)
+            if value is None:
+                raise self._invalid(chinese_num)
+            if value < 10:
+                # 数字（包括零）：连续数字按位累积，如"二〇二四"为2024
+                temp = temp * 10 + value
+            elif value < 10000:
+                # 小单位（十、百、千），没有前置数字时默认为1（如"十"表示10）
+                section += (temp or 1) * value
+                temp = 0
+            elif value < _NEGATIVE_CODE:
+                # 大单位（万、亿、兆）作用于当前小节；紧跟在另一个大单位之后时
+                # 作用于前一项，构成"万亿""亿亿"等复合单位。量级更低的已有各项
+                # 一并并入乘数（如"两万三千亿"为23000亿）
+                section += temp
+                temp = 0
+                if section:
+                    multiplicand = section
+                    magnitude = value
+                    section = 0
+                elif terms:
+                    multiplicand, magnitude = terms.pop()
+                    result -= multiplicand
+                    magnitude *= value
+                else:
+                    # 没有前置数字时默认为1（如"万"表示10000）
+                    multiplicand = 1
+                    magnitude = value
+                while terms and terms[-1][1] < magnitude:
+                    lower = terms.pop()[0]
+                    result -= lower
+                    multiplicand += lower
+                multiplicand *= value
+                terms.append((multiplicand, magnitude))
+                result += multiplicand
+            elif (
+                value == _NEGATIVE_CODE
+                and not negative
+                and chinese_num[0] == NEGATIVE_SIGN
+            ):
+                # 负号只能出现在开头
+                negative = True
+            elif value == _POINT_CODE:
+                # 小数点之后的部分只含数字，单独翻译
+                point = chinese_num.index(DECIMAL_POINT)
+                if point == negative:
+                    raise ValueError(f"中文数字缺少整数部分: {chinese_num}")
+                fraction_part = chinese_num[point + 1 :]
+                break
             else:
-                # 处理低级单位（十、百、千）
-                current_section += temp_value * unit_val
+                raise ValueError(f"负号只能出现在中文数字开头: {chinese_num}")
 
-            # 重置临时值
-            temp_value = 0
+        result += section + temp
+        if fraction_part is not None:
+            digits = fraction_part.translate(self._fraction_digits)
+            if not (digits.isascii() and digits.isdigit()):
+                raise ValueError(f"小数点后只能是数字: {chinese_num}")
+            result = float(f"{result}.{digits}")
+        if negative:
+            if len(chinese_num) == 1:
+                raise ValueError(f"中文数字缺少整数部分: {chinese_num}")
+            return -result
+        return result
 
-    # 添加最后剩余的值
-    current_section += temp_value
-    result += current_section
+    __call__ = convert
 
-    return result
+    def _invalid(self, chinese_num: str) -> ValueError:
+        """构造包含全部无效字符的错误（仅在出错时才收集）"""
+        invalid_chars = [c for c in chinese_num if c not in self._table]
+        return ValueError(f"包含无效的中文数字字符: {', '.join(invalid_chars)}")
 
 
-def process_files(target_path: Path) -> None:
+# 默认转换器实例
+DEFAULT_CONVERTER = Converter()
+
+# 缓存淘汰策略
+CACHE_POLICIES = ("lru", "fifo")
+# 数字查找表文件的标识和格式版本
+NUMERAL_TABLE_MAGIC = b"cn2an-table"
+NUMERAL_TABLE_VERSION = 1
+
+_SECTION_DIGITS = "零一二三四五六七八九"
+_SECTION_UNITS = ("", "十", "百", "千")
+
+
+def _format_section(n: int) -> str:
     """
-    处理目标目录中的文件，将中文数字文件名转换为阿拉伯数字
-    :param target_path: 目标目录路径
+    将0-9999之间的数字格式化为中文数字小节（如1010 -> '一千零一十'）
     """
-    if not target_path.exists():
-        logging.error(f"错误: 目录 '{target_path}' 不存在，请检查路径是否正确")
-        return
+    parts = []
+    zero = False
+    for power in (3, 2, 1, 0):
+        digit = n // 10**power % 10
+        if digit:
+            if zero:
+                parts.append("零")
+                zero = False
+            parts.append(_SECTION_DIGITS[digit] + _SECTION_UNITS[power])
+        elif parts:
+            zero = True
+    return "".join(parts)
 
-    if not target_path.is_dir():
-        logging.error(f"错误: '{target_path}' 不是一个目录")
-        return
 
-    files = [entry for entry in target_path.iterdir() if entry.is_file()]
-    total_files = len(files)
-    processed_files = 0
-    renamed_files = 0
+# 0-9999的小节写法表，首次使用时生成
+_section_table: Optional[List[str]] = None
 
-    logging.info(f"开始处理: 共发现 {total_files} 个文件")
 
-    for entry in files:
-        processed_files += 1
-        if process_single_file(entry):
-            renamed_files += 1
+def _get_section_table() -> List[str]:
+    """获取0-9999的小节写法表，首次调用时生成（约1万个条目）"""
+    global _section_table
+    if _section_table is None:
+        _section_table = [_format_section(n) for n in range(10000)]
+    return _section_table
+
+
+def _group_unit(index: int) -> str:
+    """第index个四位小节（从低位起，0开始）的单位：''、万、亿、万亿、亿亿……"""
+    return "万" * (index % 2) + "亿" * (index // 2)
 
-    logging.info(
-        f"处理完成: 共处理 {processed_files} 个文件，成功重命名 {renamed_files} 个文件"
-    )
 
+# 常用的小节单位，超出时由_group_unit生成
+_GROUP_UNITS = tuple(_group_unit(i) for i in range(8))
 
-def process_single_file(file_path: Path) -> bool:
+
+def _format_integer(n: int) -> str:
+    """将非负整数格式化为中文数字（n为0时返回'零'）"""
+    if n < 10000:
+        if not n:
+            return "零"
+        text = _get_section_table()[n]
+    else:
+        table = _get_section_table()
+        groups = []
+        while n:
+            n, group = divmod(n, 10000)
+            groups.append(group)
+        parts = []
+        need_zero = False
+        for index in range(len(groups) - 1, -1, -1):
+            group = groups[index]
+            if not group:
+                need_zero = True
+                continue
+            if parts and (need_zero or group < 1000):
+                parts.append("零")
+            parts.append(table[group])
+            parts.append(
+                _GROUP_UNITS[index] if index < len(_GROUP_UNITS) else _group_unit(index)
+            )
+            need_zero = False
+        text = "".join(parts)
+    # 开头的"一十"习惯写作"十"（如10 -> '十', 100000 -> '十万'）
+    return text[1:] if text.startswith("一十") else text
+
+
+def arabic_to_chinese(number: Union[int, float]) -> str:
     """
-    处理单个文件，检查并转换文件名中的中文数字
-    :param file_path: 文件路径
-    :return: 如果文件被成功重命名则返回True，否则返回False
+    将阿拉伯数字转换为中文数字，chinese_to_arabic的逆操作
+    按四位小节查表后用万、亿连接（如123 -> '一百二十三', 100000001 -> '一亿零一'）
+    :param number: 整数或浮点数（浮点数按十进制表示逐位写出小数部分，如3.5 -> '三点五'）
+    :return: 中文数字字符串
+    :raises TypeError: 如果number不是整数或浮点数
+    :raises ValueError: 如果浮点数不是有限值或无法以定点形式表示
     """
-    match = CHINESE_NUM_PATTERN.search(file_path.name)
-    if not match:
-        logging.debug(f"文件 '{file_path.name}' 不符合命名格式，已跳过")
-        return False
+    if type(number) is int:
+        if number < 0:
+            return NEGATIVE_SIGN + _format_integer(-number)
+        return _format_integer(number)
+    if isinstance(number, bool) or not isinstance(number, (int, float)):
+        raise TypeError(f"无法转换的数字类型: {type(number).__name__}")
+    if isinstance(number, int):
+        return arabic_to_chinese(int(number))
 
-    chinese_number = match.group(1)
-    try:
-        num = chinese_to_arabic(chinese_number)
-        new_name = re.sub(
-            rf"第{re.escape(chinese_number)}", str(num), file_path.name, count=1
-        )
+    text = repr(number)
+    if not text.replace("-", "", 1).replace(".", "", 1).isdigit():
+        # inf、nan以及科学计数法表示的浮点数
+        raise ValueError(f"无法转换的数字: {text}")
+    sign = NEGATIVE_SIGN if text.startswith("-") else ""
+    integer_part, _, fraction_part = text.lstrip("-").partition(".")
+    result = sign + _format_integer(int(integer_part))
+    if fraction_part.strip("0"):
+        result += DECIMAL_POINT + "".join(_SECTION_DIGITS[int(d)] for d in fraction_part)
+    return result
 
-        if new_name == file_path.name:
-            logging.warning(f"警告: 文件名 '{file_path.name}' 未发生变化，已跳过")
-            return False
 
-        new_path = file_path.parent / new_name
+class ConversionCache:
+    """
+    有界的中文数字转换缓存
 
-        if not file_path.exists():
-            logging.error(f"错误: 文件 '{file_path}' 不存在，已跳过")
-            return False
+    位于转换器之前，记录命中、未命中和淘汰次数以便调整容量。
+    转换失败的输入不会被缓存。
+    """
 
-        if new_path.exists():
-            logging.error(
-                f"错误: 新文件名 '{new_name}' 已存在，文件 '{file_path.name}' 已跳过"
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        policy: str = "lru",
+        converter: Optional[Converter] = None,
+    ) -> None:
+        """
+        :param maxsize: 最大缓存条目数
+        :param policy: 淘汰策略，'lru'淘汰最久未使用的条目，'fifo'淘汰最早写入的条目
+        :param converter: 未命中时使用的转换器，默认使用DEFAULT_CONVERTER
+        :raises ValueError: 如果容量或策略无效
+        """
+        if maxsize <= 0:
+            raise ValueError("缓存容量必须大于0")
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"不支持的淘汰策略: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._converter = converter or DEFAULT_CONVERTER
+        self._data: "OrderedDict[str, Union[int, float]]" = OrderedDict()
+        self._lru = policy == "lru"
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def convert(self, chinese_num: str) -> Union[int, float]:
+        """
+        通过缓存转换中文数字
+        :param chinese_num: 中文数字字符串
+        :return: 对应的阿拉伯数字
+        :raises ValueError: 如果字符串为空或包含无效字符
+        """
+        with self._lock:
+            value = self._data.get(chinese_num)
+            if value is not None:
+                self.hits += 1
+                if self._lru:
+                    self._data.move_to_end(chinese_num)
+                return value
+            self.misses += 1
+
+        value = self._converter.convert(chinese_num)
+        with self._lock:
+            self._store(chinese_num, value)
+        return value
+
+    def _store(self, chinese_num: str, value: Union[int, float]) -> None:
+        """写入条目，超出容量时按策略淘汰（调用方需持有锁）"""
+        data = self._data
+        data[chinese_num] = value
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+
+    def prewarm(self, limit: int = 100000) -> int:
+        """
+        用1到limit的常用中文写法预先填充缓存，预热不计入命中统计
+        :param limit: 预热的最大数值（最多填充maxsize个条目，超出时记录警告）
+        :return: 实际写入的条目数
+        """
+        count = min(limit, self.maxsize)
+        if count < limit:
+            logging.warning(
+                "预热范围 1-%s 超过缓存容量 %s，只预热 1-%s", limit, self.maxsize, count
             )
-            return False
+        convert = self._converter.convert
+        with self._lock:
+            for n in range(1, count + 1):
+                text = arabic_to_chinese(n)
+                self._store(text, convert(text))
+        return count
 
-        file_path.rename(new_path)
-        logging.info(f"成功重命名: {file_path.name} -> {new_name}")
-        return True
+    def clear(self) -> None:
+        """清空缓存并重置统计"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
 
-    except ValueError as e:
-        logging.error(f"格式错误: {e}，文件 '{file_path.name}' 已跳过")
-        return False
-    except Exception as e:
-        logging.error(f"处理文件 '{file_path.name}' 时出错: {str(e)}")
-        return False
+    def stats(self) -> Dict[str, float]:
+        """
+        获取缓存统计信息
+        :return: 包含hits、misses、evictions、size、maxsize和hit_rate的字典
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
 
 
-def exit_with_error(message: str, exit_code: int = 1) -> NoReturn:
+# 当前启用的转换缓存，None表示未启用
+_conversion_cache: Optional[ConversionCache] = None
+
+
+def enable_cache(
+    maxsize: int = 4096, policy: str = "lru", prewarm: int = 0
+) -> ConversionCache:
     """
-    输出错误消息并退出程序
-    :param message: 错误消息
-    :param exit_code: 退出码
+    为chinese_to_arabic启用转换缓存
+    :param maxsize: 最大缓存条目数，小于prewarm时扩大到prewarm
+    :param policy: 淘汰策略（'lru'或'fifo'）
+    :param prewarm: 预热的最大数值，0表示不预热
+    :return: 新启用的缓存对象
     """
-    logging.error(message)
-    exit(exit_code)
+    global _conversion_cache
+    if prewarm > maxsize:
+        logging.info("缓存容量 %s 小于预热范围，已扩大到 %s", maxsize, prewarm)
+        maxsize = prewarm
+    cache = ConversionCache(maxsize, policy)
+    if prewarm:
+        cache.prewarm(prewarm)
+    _conversion_cache = cache
+    return cache
+
 
+def disable_cache() -> None:
+    """关闭chinese_to_arabic的转换缓存"""
+    global _conversion_cache
+    _conversion_cache = None
 
-def configure_logging(verbose: bool = False) -> None:
+
+def get_cache() -> Optional[ConversionCache]:
     """
-    配置日志系统
-    :param verbose: 如果为True，则启用DEBUG级别日志
+    获取当前启用的转换缓存
+    :return: 缓存对象，未启用时返回None
     """
-    log_level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    return _conversion_cache
 
 
-def preview_conversions(
-    folder_path, match_pattern=r"第{cn_num}", replace_pattern=r"{an_num}"
-):
+class NumeralTable:
     """
-    预览文件转换效果，返回转换列表但不实际修改文件
+    常用范围内的中文数字查找表
 
-    Args:
-        folder_path: 目标文件夹路径
-        match_pattern: 匹配模式，包含{cn_num}占位符表示中文数字位置
-        replace_pattern: 替换模式，包含{an_num}占位符表示阿拉伯数字位置
+    以arabic_to_chinese生成的标准写法为键、对应整数为值，
+    表内的输入一次字典查找即可得到结果，表外的输入交给转换器逐字解析。
+    查找表在首次查找时才构建，也可以从save()写出的文件直接加载。
+    """
 
-    Returns:
-        转换列表，每个元素是(原文件entry, 新文件名)的元组
+    def __init__(self, limit: int = 100000, converter: Optional[Converter] = None) -> None:
+        """
+        :param limit: 表中的最大数值（包含0到limit）
+        :param converter: 表外输入使用的转换器，默认使用DEFAULT_CONVERTER
+        :raises ValueError: 如果limit为负数
+        """
+        if limit < 0:
+            raise ValueError("查找表上限不能为负数")
+        self.limit = limit
+        self._converter = converter or DEFAULT_CONVERTER
+        self._index: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._get_index())
+
+    def __contains__(self, chinese_num: str) -> bool:
+        return chinese_num in self._get_index()
+
+    def _get_index(self) -> Dict[str, int]:
+        """获取查找表，首次调用时构建"""
+        index = self._index
+        if index is None:
+            with self._lock:
+                index = self._index
+                if index is None:
+                    index = self._index = {
+                        arabic_to_chinese(n): n for n in range(self.limit + 1)
+                    }
+        return index
+
+    def get(self, chinese_num: str) -> Optional[int]:
+        """
+        只查表，不解析
+        :param chinese_num: 中文数字字符串
+        :return: 对应的整数，不在表中时返回None
+        """
+        return self._get_index().get(chinese_num)
+
+    def convert(self, chinese_num: str) -> Union[int, float]:
+        """
+        转换中文数字，不在表中时交给转换器解析
+        :param chinese_num: 中文数字字符串
+        :return: 对应的阿拉伯数字
+        :raises ValueError: 如果字符串为空、包含无效字符或格式错误
+        """
+        value = self._get_index().get(chinese_num)
+        if value is None:
+            return self._converter.convert(chinese_num)
+        return value
+
+    def save(self, path: str) -> None:
+        """
+        将查找表写入文件
+        文件只保存按数值顺序排列的中文写法（数值由位置隐含），并用zlib压缩
+        :param path: 文件路径
+        """
+        import zlib
+
+        header = b"%s %d %d\n" % (NUMERAL_TABLE_MAGIC, NUMERAL_TABLE_VERSION, self.limit)
+        body = "\n".join(self._get_index()).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(zlib.compress(body, 9))
+
+    @classmethod
+    def load(cls, path: str, converter: Optional[Converter] = None) -> "NumeralTable":
+        """
+        从save()写出的文件加载查找表
+        :param path: 文件路径
+        :param converter: 表外输入使用的转换器，默认使用DEFAULT_CONVERTER
+        :return: 已构建好的查找表
+        :raises ValueError: 如果文件格式或版本不正确
+        """
+        import zlib
+
+        with open(path, "rb") as f:
+            header = f.readline().split()
+            data = f.read()
+        if (
+            len(header) != 3
+            or header[0] != NUMERAL_TABLE_MAGIC
+            or header[1] != b"%d" % NUMERAL_TABLE_VERSION
+        ):
+            raise ValueError(f"'{path}' 不是有效的数字查找表文件")
+        limit = int(header[2])
+        try:
+            keys = zlib.decompress(data).decode("utf-8").split("\n")
+        except (zlib.error, UnicodeDecodeError) as e:
+            raise ValueError(f"数字查找表文件 '{path}' 已损坏: {e}") from e
+        if len(keys) != limit + 1:
+            raise ValueError(f"数字查找表文件 '{path}' 已损坏: 条目数与上限不符")
+        table = cls(limit, converter)
+        table._index = dict(zip(keys, range(limit + 1)))
+        return table
+
+
+# 当前启用的数字查找表，None表示未启用
+_numeral_table: Optional[NumeralTable] = None
+
+
+def enable_table(limit: int = 100000, path: Optional[str] = None) -> NumeralTable:
     """
-    conversion_list = []
-    # 解析匹配模式，将{cn_num}替换为中文数字正则表达式
-    cn_num_regex = r"([零一二三四五六七八九十百千万亿]+)"
-    # 转义特殊字符，但保留{cn_num}的替换
-    regex_pattern = re.escape(match_pattern).replace(r"\{cn_num\}", cn_num_regex)
-    pattern = re.compile(regex_pattern)
-
-    for entry in os.scandir(folder_path):
-        if entry.is_file():
-            match = pattern.search(entry.name)
-            if match:
-                chinese_number = match.group(1)
-                try:
-                    num = chinese_to_arabic(chinese_number)
-                    # 应用替换模式
-                    new_name = pattern.sub(
-                        replace_pattern.replace("{an_num}", str(num)),
-                        entry.name,
-                        count=1,
-                    )
-                    conversion_list.append((entry, new_name))
-                except ValueError as e:
-                    logging.warning(f"无法转换中文数字: {chinese_number}, 错误: {e}")
+    为chinese_to_arabic启用数字查找表，查找表在首次转换时才构建
+    :param limit: 表中的最大数值
+    :param path: 查找表文件，存在时直接加载（忽略limit），不存在时构建后写入该文件
+    :return: 新启用的查找表
+    """
+    global _numeral_table
+    if path is not None and os.path.exists(path):
+        table = NumeralTable.load(path)
+    else:
+        table = NumeralTable(limit)
+        if path is not None:
+            table.save(path)
+    _numeral_table = table
+    return table
 
-    return conversion_list
 
+def disable_table() -> None:
+    """关闭chinese_to_arabic的数字查找表"""
+    global _numeral_table
+    _numeral_table = None
 
-def perform_conversions(conversion_list):
+
+def get_table() -> Optional[NumeralTable]:
     """
-    执行文件转换，实际修改文件名
+    获取当前启用的数字查找表
+    :return: 查找表对象，未启用时返回None
+    """
+    return _numeral_table
 
-    Args:
-        conversion_list: 由preview_conversions返回的转换列表
 
-    Returns:
-        成功转换的文件数量
+def chinese_to_arabic(chinese_num: str) -> Union[int, float]:
     """
-    success_count = 0
-    for entry, new_name in conversion_list:
+    将中文数字转换为阿拉伯数字
+    :param chinese_num: 中文数字字符串（如'一', '十', '一百二十三', '十亿', '两万', '三点五'）
+    :return: 对应的阿拉伯数字，包含小数点时为float
+    :raises ValueError: 如果字符串为空、包含无效字符或格式错误
+    """
+    table = _numeral_table
+    if table is not None:
+        value = table.get(chinese_num)
+        if value is not None:
+            return value
+    cache = _conversion_cache
+    if cache is not None:
+        return cache.convert(chinese_num)
+    return DEFAULT_CONVERTER.convert(chinese_num)
+
+
+class BatchResult(NamedTuple):
+    """
+    批量转换结果
+    values: 转换结果，失败项在列表中为None，在array中为0
+            （array只能保存64位整数，小数及超出范围的结果在array模式下记为失败）
+    errors: 错误掩码，失败项对应位置为1
+    """
+
+    values: Union[List[Optional[Union[int, float]]], "array[int]"]
+    errors: bytearray
+
+
+def chinese_to_arabic_many(
+    chinese_nums: Iterable[str],
+    as_array: bool = False,
+    converter: Optional[Converter] = None,
+) -> BatchResult:
+    """
+    批量将中文数字转换为阿拉伯数字，遇到无效输入时不抛出异常而是记录到错误掩码
+    重复的输入只转换一次
+    :param chinese_nums: 中文数字字符串的列表或迭代器
+    :param as_array: 为True时以紧凑的array('q')返回结果，小数及超出64位范围的结果记为失败
+    :param converter: 使用的转换器，默认使用DEFAULT_CONVERTER
+    :return: BatchResult(values, errors)
+    """
+    from array import array
+
+    convert = (converter or DEFAULT_CONVERTER).convert
+    memo: Dict[str, Optional[Union[int, float]]] = {}
+    values = array("q") if as_array else []
+    errors = bytearray()
+    missing = 0 if as_array else None
+    append_value = values.append
+    append_error = errors.append
+
+    for text in chinese_nums:
+        if text in memo:
+            value = memo[text]
+        else:
+            try:
+                value = convert(text)
+            except ValueError:
+                value = None
+            if as_array and value is not None and not (
+                type(value) is int and -(1 << 63) <= value < (1 << 63)
+            ):
+                value = None
+            memo[text] = value
+        if value is None:
+            append_value(missing)
+            append_error(1)
+        else:
+            append_value(value)
+            append_error(0)
+
+    return BatchResult(values, errors)
+
+
+def arabic_to_chinese_many(numbers: Iterable[Union[int, float]]) -> BatchResult:
+    """
+    批量将阿拉伯数字转换为中文数字，遇到无效输入时不抛出异常而是记录到错误掩码
+    :param numbers: 数字的列表或迭代器
+    :return: BatchResult(values, errors)，values为中文数字字符串列表，失败项为None
+    """
+    _get_section_table()
+    values: List[Optional[str]] = []
+    errors = bytearray()
+    append_value = values.append
+    append_error = errors.append
+    for number in numbers:
         try:
-            new_path = os.path.join(os.path.dirname(entry.path), new_name)
-            os.rename(entry.path, new_path)
-            success_count += 1
-            logging.info(f"已转换: {entry.name} -> {new_name}")
-        except Exception as e:
-            logging.error(f"转换失败: {entry.name}, 错误: {e}")
+            append_value(arabic_to_chinese(number))
+            append_error(0)
+        except (TypeError, ValueError):
+            append_value(None)
+            append_error(1)
+    return BatchResult(values, errors)
 
-    return success_count
 
+class NumeralSpan(NamedTuple):
+    """
+    文本中的一个中文数字
+    start/end: 在原文本中的起止位置
+    text: 中文数字原文
+    value: 转换后的数值
+    """
 
-if __name__ == "__main__":
-    # 保留命令行功能
-    import argparse
+    start: int
+    end: int
+    text: str
+    value: Union[int, float]
 
-    parser = argparse.ArgumentParser(
-        description=f"{__version__}中文数字文件名转换工具 v{__version__}"
-    )
-    parser.add_argument("--path", default=".", help="目标目录路径")
-    parser.add_argument("-v", "--verbose", action="store_true", help="显示详细日志信息")
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {__version__}"
-    )
-    args = parser.parse_args()
 
-    configure_logging(args.verbose)
+class TextConversion(NamedTuple):
+    """
+    全文转换结果
+    text: 转换后的文本
+    spans: 被转换的中文数字（位置基于原文本）
+    """
+
+    text: str
+    spans: List[NumeralSpan]
+
+
+def iter_numerals(
+    text: str,
+    require_prefix: bool = False,
+    min_length: int = 1,
+    converter: Optional[Converter] = None,
+) -> Iterator[NumeralSpan]:
+    """
+    找出文本中所有的中文数字
+
+    对文本只做一次线性扫描，重复出现的中文数字只转换一次，无法转换的片段被跳过。
+    :param text: 任意文本
+    :param require_prefix: 为True时只匹配紧跟在"第"之后的中文数字
+    :param min_length: 中文数字的最小长度，可用于忽略单字（如"一起"中的"一"）
+    :param converter: 使用的转换器，默认使用DEFAULT_CONVERTER
+    :return: NumeralSpan迭代器
+    """
+    pattern = _numeral_run_pattern(require_prefix)
+    convert = (converter or DEFAULT_CONVERTER).convert
+    memo: Dict[str, Optional[Union[int, float]]] = {}
+
+    for match in pattern.finditer(text):
+        numeral = match.group()
+        if len(numeral) < min_length:
+            continue
+        if numeral in memo:
+            value = memo[numeral]
+        else:
+            try:
+                value = convert(numeral)
+            except ValueError:
+                value = None
+            memo[numeral] = value
+        if value is not None:
+            yield NumeralSpan(match.start(), match.end(), numeral, value)
+
+
+def find_numerals(
+    text: str,
+    require_prefix: bool = False,
+    min_length: int = 1,
+    converter: Optional[Converter] = None,
+) -> List[NumeralSpan]:
+    """
+    找出文本中所有的中文数字，参数同iter_numerals
+    :return: NumeralSpan列表
+    """
+    return list(iter_numerals(text, require_prefix, min_length, converter))
+
+
+def convert_text(
+    text: str,
+    require_prefix: bool = False,
+    min_length: int = 1,
+    converter: Optional[Converter] = None,
+) -> TextConversion:
+    """
+    将文本中所有的中文数字替换为阿拉伯数字（保留"第"等前后文字）
+    :param text: 任意文本
+    :param require_prefix: 为True时只转换紧跟在"第"之后的中文数字
+    :param min_length: 中文数字的最小长度
+    :param converter: 使用的转换器，默认使用DEFAULT_CONVERTER
+    :return: TextConversion(转换后的文本, 中文数字位置列表)
+    """
+    pieces = []
+    spans = []
+    last = 0
+    for span in iter_numerals(text, require_prefix, min_length, converter):
+        pieces.append(text[last : span.start])
+        pieces.append(str(span.value))
+        last = span.end
+        spans.append(span)
+    pieces.append(text[last:])
+    return TextConversion("".join(pieces), spans)
+
+
+# mmap扫描时缓存的不同中文数字数量上限，超过后清空，保证内存占用与文件大小无关
+SCAN_MEMO_SIZE = 4096
+
+
+def scan_file_mmap(
+    path,
+    require_prefix: bool = False,
+    min_length: int = 1,
+    converter: Optional[Converter] = None,
+) -> Iterator[NumeralSpan]:
+    """
+    通过mmap扫描UTF-8文件中的中文数字，不解码、不复制整个文件
+
+    直接在映射的字节上匹配中文数字的UTF-8编码，只解码匹配到的片段；
+    转换结果的缓存最多保存SCAN_MEMO_SIZE个条目，内存占用与文件大小无关。
+    返回的start/end为字节偏移。
+    :param path: UTF-8文本文件路径
+    :param require_prefix: 为True时只匹配紧跟在"第"之后的中文数字
+    :param min_length: 中文数字的最小长度（字符数）
+    :param converter: 使用的转换器，默认使用DEFAULT_CONVERTER
+    :return: NumeralSpan迭代器（start/end为字节偏移）
+    """
+    import mmap
+
+    pattern = _numeral_bytes_pattern(require_prefix)
+    convert = (converter or DEFAULT_CONVERTER).convert
+    memo: Dict[bytes, Optional[Tuple[str, Union[int, float]]]] = {}
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            for match in pattern.finditer(mapped):
+                raw = match.group()
+                if raw in memo:
+                    found = memo[raw]
+                else:
+                    numeral = raw.decode("utf-8")
+                    try:
+                        found = (numeral, convert(numeral))
+                    except ValueError:
+                        found = None
+                    if len(memo) >= SCAN_MEMO_SIZE:
+                        memo.clear()
+                    memo[raw] = found
+                if found is not None and len(found[0]) >= min_length:
+                    yield NumeralSpan(match.start(), match.end(), found[0], found[1])
+
+
+# 流式转换默认的读取块大小（字符数）
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _safe_cut(data: str) -> int:
+    """
+    计算可以安全转换的前缀长度：末尾连续的中文数字（及其前的"第"）
+    可能与下一块相连，需要留到下一块一起处理
+    """
+    cut = len(data)
+    while cut and data[cut - 1] in _VALID_CHARS:
+        cut -= 1
+    if cut and data[cut - 1] == "第":
+        cut -= 1
+    return cut
+
+
+def _line_cut(data: str) -> int:
+    """
+    计算按行切分的安全前缀长度，用于多进程分片
+    没有换行符时退回到_safe_cut
+    """
+    cut = data.rfind("\n") + 1
+    return cut if cut else _safe_cut(data)
+
+
+def _iter_shards(
+    source: IO[str], chunk_size: int, cut_func: Callable[[str], int]
+) -> Iterator[str]:
+    """
+    按固定大小读取文本流，并在安全边界处切分，保证中文数字不会被拆开
+    :param source: 输入文本流
+    :param chunk_size: 每次读取的字符数
+    :param cut_func: 计算安全前缀长度的函数
+    :return: 文本分片迭代器，依次拼接即为完整输入
+    """
+    if chunk_size <= 0:
+        raise ValueError("分块大小必须大于0")
+    carry = ""
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        data = carry + chunk if carry else chunk
+        cut = cut_func(data)
+        if not cut:
+            # 整块都不能切分，继续累积
+            carry = data
+            continue
+        yield data[:cut]
+        carry = data[cut:]
+    if carry:
+        yield carry
+
+
+def _convert_shard(shard: str, require_prefix: bool, min_length: int) -> Tuple[str, int]:
+    """
+    在工作进程中转换一个文本分片
+    :return: (转换后的文本, 转换的中文数字数量)
+    """
+    result = convert_text(shard, require_prefix, min_length)
+    return result.text, len(result.spans)
+
+
+def _convert_stream_parallel(
+    source: IO[str],
+    target: IO[str],
+    chunk_size: int,
+    require_prefix: bool,
+    min_length: int,
+    jobs: int,
+) -> int:
+    """
+    使用进程池并行转换文本流，按行边界分片，按输入顺序写出结果
+    同时提交的分片数量有上限，内存占用与文件大小无关
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    count = 0
+    pending: deque = deque()
+    max_pending = jobs * 2
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for shard in _iter_shards(source, chunk_size, _line_cut):
+            pending.append(
+                executor.submit(_convert_shard, shard, require_prefix, min_length)
+            )
+            if len(pending) >= max_pending:
+                text, converted = pending.popleft().result()
+                target.write(text)
+                count += converted
+        while pending:
+            text, converted = pending.popleft().result()
+            target.write(text)
+            count += converted
+    return count
+
+
+def convert_stream(
+    source: IO[str],
+    target: IO[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    require_prefix: bool = False,
+    min_length: int = 1,
+    jobs: int = 1,
+) -> int:
+    """
+    流式转换文本中的中文数字，按固定大小分块读取，内存占用与文件大小无关
+    跨块边界的中文数字会被完整保留到下一块再转换
+    :param source: 输入文本流
+    :param target: 输出文本流
+    :param chunk_size: 每次读取的字符数
+    :param require_prefix: 为True时只转换紧跟在"第"之后的中文数字
+    :param min_length: 中文数字的最小长度
+    :param jobs: 并行转换的进程数，大于1时使用进程池按行分片转换
+    :return: 转换的中文数字数量
+    """
+    if jobs <= 0:
+        raise ValueError("进程数必须大于0")
+    if jobs > 1:
+        return _convert_stream_parallel(
+            source, target, chunk_size, require_prefix, min_length, jobs
+        )
+    converter = DEFAULT_CONVERTER
+    count = 0
+    for shard in _iter_shards(source, chunk_size, _safe_cut):
+        result = convert_text(shard, require_prefix, min_length, converter)
+        target.write(result.text)
+        count += len(result.spans)
+    return count
+
+
+def _open_text(path: str, mode: str, encoding: str) -> IO[str]:
+    """
+    打开文本文件，路径为'-'时使用标准输入/输出
+    保留原始换行符，无法解码的字节原样写回
+    """
+    import io
+    import sys
+
+    if path == "-":
+        stream = sys.stdin if "r" in mode else sys.stdout
+        return io.TextIOWrapper(
+            stream.buffer,
+            encoding=encoding,
+            errors="surrogateescape",
+            newline="",
+            write_through=False,
+        )
+    return open(path, mode, encoding=encoding, errors="surrogateescape", newline="")
+
+
+def convert_file(
+    input_path: str = "-",
+    output_path: str = "-",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    require_prefix: bool = False,
+    min_length: int = 1,
+    encoding: str = "utf-8",
+    jobs: int = 1,
+) -> int:
+    """
+    转换文本文件中的中文数字
+    :param input_path: 输入文件路径，'-'表示标准输入
+    :param output_path: 输出文件路径，'-'表示标准输出
+    :param chunk_size: 每次读取的字符数
+    :param require_prefix: 为True时只转换紧跟在"第"之后的中文数字
+    :param min_length: 中文数字的最小长度
+    :param encoding: 文件编码
+    :param jobs: 并行转换的进程数
+    :return: 转换的中文数字数量
+    """
+    source = _open_text(input_path, "r", encoding)
     try:
-        target_path = Path(args.path).resolve()
-        process_files(target_path)
+        target = _open_text(output_path, "w", encoding)
+        try:
+            return convert_stream(
+                source, target, chunk_size, require_prefix, min_length, jobs
+            )
+        finally:
+            if output_path == "-":
+                # 不关闭标准输出本身
+                target.flush()
+                target.detach()
+            else:
+                target.close()
+    finally:
+        if input_path == "-":
+            source.detach()
+        else:
+            source.close()
+
+
+class ConversionRule:
+    """
+    编译后的文件名转换规则
+
+    匹配模式到正则表达式的转换和替换模板的拆分只在构造时进行一次，
+    生成新文件名时直接按匹配位置拼接，不再额外运行正则替换。
+    反向规则将文件名中的阿拉伯数字转换为中文数字，此时两个占位符的角色互换。
+    """
+
+    __slots__ = (
+        "match_pattern",
+        "replace_pattern",
+        "reverse",
+        "_regex",
+        "_pattern",
+        "_replace_parts",
+    )
+
+    def __init__(
+        self,
+        match_pattern: str = r"第{cn_num}",
+        replace_pattern: str = r"{an_num}",
+        reverse: bool = False,
+    ) -> None:
+        """
+        :param match_pattern: 匹配模式，包含{cn_num}占位符表示中文数字位置
+                              （反向规则包含{an_num}占位符表示阿拉伯数字位置）
+        :param replace_pattern: 替换模式，包含{an_num}占位符表示阿拉伯数字位置
+                                （反向规则包含{cn_num}占位符表示中文数字位置）
+        :param reverse: 为True时将阿拉伯数字转换为中文数字
+        :raises ValueError: 如果匹配模式缺少对应的占位符
+        """
+        source, target, regex = (
+            ("{an_num}", "{cn_num}", AN_NUM_REGEX)
+            if reverse
+            else ("{cn_num}", "{an_num}", CN_NUM_REGEX)
+        )
+        if source not in match_pattern:
+            raise ValueError(f"匹配模式必须包含{source}占位符")
+        self.match_pattern = match_pattern
+        self.replace_pattern = replace_pattern
+        self.reverse = reverse
+        # 转义特殊字符，但保留占位符的替换；正则在首次使用时才编译
+        self._regex = re.escape(match_pattern).replace(re.escape(source), regex)
+        self._pattern: Optional["re.Pattern[str]"] = None
+        self._replace_parts = replace_pattern.split(target)
+
+    @property
+    def pattern(self) -> "re.Pattern[str]":
+        """编译后的匹配正则"""
+        pattern = self._pattern
+        if pattern is None:
+            pattern = self._pattern = re.compile(self._regex)
+        return pattern
+
+    def search(self, name: str) -> Optional["re.Match[str]"]:
+        """
+        在文件名中查找第一个匹配
+        :param name: 文件名
+        :return: 匹配对象，未匹配时返回None
+        """
+        return self.pattern.search(name)
+
+    def build(self, name: str, match: "re.Match[str]") -> str:
+        """
+        根据匹配结果生成新文件名
+        :param name: 原文件名
+        :param match: search返回的匹配对象
+        :return: 新文件名
+        :raises ValueError: 如果匹配到的中文数字无法转换
+        """
+        if self.reverse:
+            num = arabic_to_chinese(int(match.group(1)))
+        else:
+            num = str(chinese_to_arabic(match.group(1)))
+        return name[: match.start()] + num.join(self._replace_parts) + name[match.end() :]
+
+    def apply(self, name: str) -> Optional[str]:
+        """
+        转换文件名
+        :param name: 原文件名
+        :return: 新文件名，未匹配时返回None
+        :raises ValueError: 如果匹配到的中文数字无法转换
+        """
+        match = self.pattern.search(name)
+        if match is None:
+            return None
+        return self.build(name, match)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_rule(
+    match_pattern: str = r"第{cn_num}",
+    replace_pattern: str = r"{an_num}",
+    reverse: bool = False,
+) -> ConversionRule:
+    """
+    获取转换规则，相同模式重复调用时直接返回已编译的规则
+    :param match_pattern: 匹配模式，包含{cn_num}占位符（反向规则为{an_num}）
+    :param replace_pattern: 替换模式，包含{an_num}占位符（反向规则为{cn_num}）
+    :param reverse: 为True时将阿拉伯数字转换为中文数字
+    :return: 编译后的转换规则
+    :raises ValueError: 如果匹配模式缺少对应的占位符
+    """
+    return ConversionRule(match_pattern, replace_pattern, reverse)
+
+
+# 默认规则：将"第X"替换为阿拉伯数字
+DEFAULT_RULE = compile_rule()
+
+# 耗时直方图的桶数：第i个桶统计耗时小于2^i微秒（且不小于2^(i-1)微秒）的样本
+STATS_HISTOGRAM_BUCKETS = 32
+
+
+class RunStats:
+    """
+    运行统计：按阶段记录计数器、累计耗时和耗时直方图
+
+    阶段包括scan（单个目录的扫描）、match（文件名正则匹配）、
+    convert（中文数字转换并生成新文件名）和rename（单次os.rename）。
+    统计默认关闭，关闭时热点路径只多一次全局变量检查；
+    开启后通过timed包装被测函数，可在多个线程中同时更新。
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, float] = {}
+        self.histograms: Dict[str, List[int]] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        增加计数器
+        :param name: 计数器名称
+        :param n: 增加的数量
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, phase: str, seconds: float) -> None:
+        """
+        记录一次阶段耗时
+        :param phase: 阶段名称
+        :param seconds: 耗时（秒）
+        """
+        bucket = min(int(seconds * 1e6).bit_length(), STATS_HISTOGRAM_BUCKETS - 1)
+        with self._lock:
+            self.timers[phase] = self.timers.get(phase, 0.0) + seconds
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = [0] * STATS_HISTOGRAM_BUCKETS
+            histogram[bucket] += 1
+
+    def timed(self, phase: str, func: Callable) -> Callable:
+        """
+        包装函数，每次调用时记录耗时（调用抛出异常时同样记录）
+        :param phase: 阶段名称
+        :param func: 被测函数
+        :return: 包装后的函数
+        """
+        record = self.record
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(phase, perf_counter() - start)
+
+        return wrapper
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        导出统计结果
+        :return: 包含总耗时、计数器以及各阶段调用次数、累计耗时和耗时分布的字典，
+                 耗时分布的键为耗时上限（如"<64us"）
+        """
+        with self._lock:
+            phases = {}
+            for phase, histogram in self.histograms.items():
+                calls = sum(histogram)
+                total = self.timers[phase]
+                phases[phase] = {
+                    "calls": calls,
+                    "total_sec": total,
+                    "mean_us": total / calls * 1e6 if calls else 0.0,
+                    "histogram": {
+                        f"<{1 << bucket}us": n for bucket, n in enumerate(histogram) if n
+                    },
+                }
+            return {
+                "elapsed_sec": time.perf_counter() - self.started,
+                "counters": dict(self.counters),
+                "phases": phases,
+            }
+
+
+# 当前启用的运行统计，None表示关闭
+_run_stats: Optional[RunStats] = None
+
+
+def enable_stats() -> RunStats:
+    """
+    开启运行统计
+    :return: 新的统计对象
+    """
+    global _run_stats
+    _run_stats = RunStats()
+    return _run_stats
+
+
+def disable_stats() -> None:
+    """关闭运行统计"""
+    global _run_stats
+    _run_stats = None
+
+
+def get_stats() -> Optional[RunStats]:
+    """
+    获取当前的运行统计
+    :return: 统计对象，未开启时返回None
+    """
+    return _run_stats
+
+
+def _rule_functions(rule: ConversionRule) -> Tuple[Callable, Callable]:
+    """获取规则的search和build方法，开启运行统计时包装为计时版本"""
+    stats = _run_stats
+    search = rule.pattern.search
+    if stats is None:
+        return search, rule.build
+    return stats.timed("match", search), stats.timed("convert", rule.build)
+
+
+def _compile_globs(patterns: Optional[Sequence[str]]) -> Optional["re.Pattern[str]"]:
+    """
+    将一组glob模式合并编译为单个正则表达式
+    :param patterns: glob模式列表（如'*.mp4'）
+    :return: 编译后的正则表达式，模式为空时返回None
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+class _IndexRecord(NamedTuple):
+    """目录索引记录：目录修改时间及上次扫描时的文件名和子目录名"""
+
+    mtime_ns: int
+    files: frozenset
+    subdirs: Tuple[str, ...]
+
+
+class ScanIndex:
+    """
+    持久化的目录扫描索引（SQLite）
+
+    按目录记录修改时间和条目名称。目录修改时间未变化时直接跳过该目录，
+    发生变化时只产出新出现的文件。索引绑定到匹配设置，设置变化时自动清空。
+    符合转换规则的文件会通过forget()移出索引，因此因冲突等原因未能重命名的文件、
+    以及撤销后恢复原名的文件，在下次运行时会被重新处理。
+    """
+
+    def __init__(self, path) -> None:
+        """
+        :param path: 索引文件路径，不存在时自动创建
+        """
+        import sqlite3
+
+        self.path = os.fspath(path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, files TEXT, subdirs TEXT)"
+        )
+        self._raw: Dict[str, Tuple[int, str, str]] = {
+            row[0]: row[1:]
+            for row in self._conn.execute("SELECT path, mtime_ns, files, subdirs FROM dirs")
+        }
+        self._dirty: Dict[str, Tuple[int, str, str]] = {}
+        self._forgotten: Dict[str, set] = {}
+        self._staged: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        self._reset = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ScanIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def bind(self, key: str) -> None:
+        """
+        绑定匹配设置，与上次保存的设置不同时清空索引
+        :param key: 描述匹配设置的字符串
+        """
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'settings'"
+        ).fetchone()
+        if row is not None and row[0] == key:
+            return
+        with self._lock:
+            self._raw.clear()
+            self._dirty.clear()
+            self._forgotten.clear()
+            self._staged.clear()
+            self._reset = True
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('settings', ?)", (key,)
+        )
+
+    def get(self, directory: str) -> Optional[_IndexRecord]:
+        """
+        获取目录的索引记录
+        :param directory: 目录路径
+        :return: 索引记录，不存在时返回None
+        """
+        raw = self._raw.get(os.path.abspath(directory))
+        if raw is None:
+            return None
+        mtime_ns, files, subdirs = raw
+        return _IndexRecord(
+            mtime_ns,
+            frozenset(files.split("\0")) if files else frozenset(),
+            tuple(subdirs.split("\0")) if subdirs else (),
+        )
+
+    def put(
+        self, directory: str, mtime_ns: int, files: List[str], subdirs: List[str]
+    ) -> None:
+        """
+        更新目录的索引记录（保存前仅保存在内存中）
+        :param directory: 目录路径
+        :param mtime_ns: 目录修改时间（纳秒）
+        :param files: 目录中的全部文件名
+        :param subdirs: 目录中的全部子目录名
+        """
+        raw = (mtime_ns, "\0".join(files), "\0".join(subdirs))
+        key = os.path.abspath(directory)
+        with self._lock:
+            self._raw[key] = raw
+            self._dirty[key] = raw
+
+    def stage(
+        self, directory: str, mtime_ns: int, files: List[str], subdirs: List[str]
+    ) -> None:
+        """
+        暂存目录的扫描结果，调用commit()后才写入索引
+        调用方提前结束遍历时，尚未处理完的目录不会被记录，下次运行时重新扫描
+        :param directory: 目录路径
+        :param mtime_ns: 目录修改时间（纳秒）
+        :param files: 目录中的全部文件名
+        :param subdirs: 目录中的全部子目录名
+        """
+        with self._lock:
+            self._staged[os.path.abspath(directory)] = (mtime_ns, files, subdirs)
+
+    def commit(self, directory: str) -> None:
+        """
+        将暂存的目录扫描结果写入索引（目录中的文件均已处理完时调用）
+        :param directory: 目录路径
+        """
+        with self._lock:
+            staged = self._staged.pop(os.path.abspath(directory), None)
+        if staged is not None:
+            self.put(directory, *staged)
+
+    def forget(self, file_path: str) -> None:
+        """
+        将文件移出索引，下次扫描时重新处理（保存时生效）
+        :param file_path: 文件路径
+        """
+        directory, name = os.path.split(os.path.abspath(file_path))
+        with self._lock:
+            self._forgotten.setdefault(directory, set()).add(name)
+
+    def save(self) -> None:
+        """将内存中的更新写入索引文件"""
+        with self._lock:
+            for directory, names in self._forgotten.items():
+                raw = self._raw.get(directory)
+                if raw is None:
+                    continue
+                _, files, subdirs = raw
+                files = "\0".join(
+                    name for name in files.split("\0") if name and name not in names
+                )
+                # 修改时间记为-1，下次运行时重新扫描该目录
+                self._raw[directory] = self._dirty[directory] = (-1, files, subdirs)
+            self._forgotten.clear()
+            # 未提交的扫描结果属于未处理完的目录，丢弃
+            self._staged.clear()
+            dirty = list(self._dirty.items())
+            self._dirty.clear()
+            reset, self._reset = self._reset, False
+        with self._conn:
+            if reset:
+                self._conn.execute("DELETE FROM dirs")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs (path, mtime_ns, files, subdirs) "
+                "VALUES (?, ?, ?, ?)",
+                [(path, *raw) for path, raw in dirty],
+            )
+
+    def close(self) -> None:
+        """保存并关闭索引"""
+        self.save()
+        self._conn.close()
+
+
+def _scan_directory(
+    path: str,
+    depth: int,
+    max_depth: Optional[int],
+    include: Optional["re.Pattern[str]"],
+    exclude: Optional["re.Pattern[str]"],
+    index: Optional[ScanIndex] = None,
+    cancel: Optional[threading.Event] = None,
+    record_stats: bool = True,
+) -> Tuple[List[os.DirEntry], List[Tuple[str, int]]]:
+    """
+    扫描单个目录，返回其中匹配的文件以及需要继续遍历的子目录
+    :param path: 目录路径
+    :param depth: 当前目录深度（根目录为0）
+    :param max_depth: 最大遍历深度，None表示不限制
+    :param include: 文件名包含模式
+    :param exclude: 文件/目录名排除模式
+    :param index: 扫描索引，提供时跳过未变化的目录和已记录的文件，
+                  扫描结果暂存到索引，由调用方处理完其中的文件后提交
+    :param cancel: 取消标志，设置后尽快返回已扫描的部分结果
+    :param record_stats: 是否将扫描的条目数计入运行统计
+    :return: (文件entry列表, [(子目录路径, 深度)]列表)
+    """
+    files = []
+    subdirs = []
+    descend = max_depth is None or depth < max_depth
+
+    known = frozenset()
+    if index is not None:
+        mtime_ns = os.stat(path).st_mtime_ns
+        record = index.get(path)
+        if record is not None:
+            if record.mtime_ns == mtime_ns:
+                # 目录未变化：不再扫描，只按记录继续遍历子目录
+                if descend:
+                    subdirs = [
+                        (os.path.join(path, name), depth + 1)
+                        for name in record.subdirs
+                        if exclude is None or not exclude.match(name)
+                    ]
+                return files, subdirs
+            known = record.files
+        file_names = []
+        dir_names = []
+
+    stats = _run_stats if record_stats else None
+    position = -1
+    with os.scandir(path) as it:
+        for position, entry in enumerate(it):
+            if (
+                cancel is not None
+                and not position % CANCEL_CHECK_INTERVAL
+                and cancel.is_set()
+            ):
+                # 部分扫描结果不写入索引
+                if stats is not None:
+                    stats.count("entries", position)
+                return files, []
+            name = entry.name
+            try:
+                # DirEntry会缓存扫描时获取的类型信息，无需再次stat
+                if entry.is_file():
+                    if index is not None:
+                        file_names.append(name)
+                        if name in known:
+                            continue
+                    if (exclude is None or not exclude.match(name)) and (
+                        include is None or include.match(name)
+                    ):
+                        files.append(entry)
+                elif entry.is_dir(follow_symlinks=False):
+                    if index is not None:
+                        dir_names.append(name)
+                    if descend and (exclude is None or not exclude.match(name)):
+                        subdirs.append((entry.path, depth + 1))
+            except OSError as e:
+                logging.warning("无法读取 '%s': %s", entry.path, e)
+
+    if stats is not None:
+        # 统计scandir返回的全部条目（包括目录和被过滤的文件）
+        stats.count("entries", position + 1)
+    if index is not None:
+        index.stage(path, mtime_ns, file_names, dir_names)
+    return files, subdirs
+
+
+def _scan_directory_safe(
+    path: str,
+    depth: int,
+    max_depth: Optional[int],
+    include: Optional["re.Pattern[str]"],
+    exclude: Optional["re.Pattern[str]"],
+    index: Optional[ScanIndex] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[List[os.DirEntry], List[Tuple[str, int]]]:
+    """
+    扫描子目录，出错时记录日志并跳过该目录
+    """
+    stats = _run_stats
+    try:
+        if stats is None:
+            return _scan_directory(
+                path, depth, max_depth, include, exclude, index, cancel
+            )
+        start = time.perf_counter()
+        files, subdirs = _scan_directory(
+            path, depth, max_depth, include, exclude, index, cancel
+        )
+        stats.record("scan", time.perf_counter() - start)
+        return files, subdirs
+    except OSError as e:
+        logging.warning("无法扫描目录 '%s': %s，已跳过", path, e)
+        if stats is not None:
+            stats.count("errors")
+        return [], []
+
+
+def walk_files(
+    root,
+    recursive: bool = False,
+    max_depth: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    workers: int = DEFAULT_SCAN_WORKERS,
+    index: Optional[ScanIndex] = None,
+    index_key: str = "",
+    cancel: Optional[threading.Event] = None,
+) -> Iterator[os.DirEntry]:
+    """
+    遍历目录中的文件，以流的形式逐个产出os.DirEntry
+
+    递归模式下子目录由有界线程池并发扫描，每扫描完一个目录即产出其中的文件，
+    调用方无需等待整棵目录树遍历结束即可开始处理。已提交和已完成但尚未产出的
+    扫描最多workers*2个，调用方暂停时扫描随之暂停，内存占用不随目录树大小增长。
+
+    Args:
+        root: 根目录路径
+        recursive: 是否递归遍历子目录
+        max_depth: 最大递归深度（根目录为0），None表示不限制
+        include: 文件名包含模式（glob），为空时包含所有文件
+        exclude: 文件名和目录名排除模式（glob），匹配的目录整体跳过
+        workers: 并发扫描线程数
+        index: 扫描索引，提供时跳过未变化的目录，只产出新出现的文件
+        index_key: 调用方的匹配设置，与遍历参数一起决定索引是否仍然有效
+        cancel: 取消标志，设置后停止扫描并结束迭代
+
+    Returns:
+        文件entry迭代器
+
+    Raises:
+        OSError: 如果根目录无法扫描
+    """
+    if not recursive:
+        max_depth = 0
+    include_re = _compile_globs(include)
+    exclude_re = _compile_globs(exclude)
+    if index is not None:
+        index.bind(repr((index_key, max_depth, include, exclude)))
+    scan = functools.partial(
+        _scan_directory_safe,
+        max_depth=max_depth,
+        include=include_re,
+        exclude=exclude_re,
+        index=index,
+        cancel=cancel,
+    )
+
+    # 根目录同步扫描，错误直接抛给调用方
+    stats = _run_stats
+    start = time.perf_counter()
+    root = os.fspath(root)
+    files, subdirs = _scan_directory(
+        root, 0, max_depth, include_re, exclude_re, index, cancel
+    )
+    if stats is not None:
+        stats.record("scan", time.perf_counter() - start)
+    yield from files
+    # 目录中的文件全部交给调用方之后才记入索引，提前结束时下次重新扫描
+    if index is not None:
+        index.commit(root)
+
+    if workers <= 1:
+        while subdirs:
+            if cancel is not None and cancel.is_set():
+                return
+            path, depth = subdirs.pop()
+            files, children = scan(path, depth)
+            subdirs.extend(children)
+            yield from files
+            if index is not None:
+                index.commit(path)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cn2an-scan")
+    try:
+        # 待扫描的子目录只保存路径，按深度优先顺序提交，同时进行的扫描数有上限
+        window = workers * 2
+        pending = {}
+        while subdirs or pending:
+            while subdirs and len(pending) < window:
+                path, depth = subdirs.pop()
+                pending[pool.submit(scan, path, depth)] = path
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.is_set():
+                return
+            for future in done:
+                path = pending.pop(future)
+                files, children = future.result()
+                subdirs.extend(children)
+                yield from files
+                if index is not None:
+                    index.commit(path)
+    finally:
+        # 调用方提前结束迭代时，丢弃尚未开始的扫描任务
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def process_files(
+    target_path: Path,
+    recursive: bool = False,
+    max_depth: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    workers: int = DEFAULT_SCAN_WORKERS,
+    rename_workers: int = 1,
+    journal: Optional["RenameJournal"] = None,
+    index: Optional[ScanIndex] = None,
+) -> None:
+    """
+    处理目标目录中的文件，将中文数字文件名转换为阿拉伯数字
+    先扫描并规划全部重命名操作（冲突检查、依赖排序），再统一执行
+    :param target_path: 目标目录路径
+    :param recursive: 是否递归处理子目录
+    :param max_depth: 最大递归深度，None表示不限制
+    :param include: 文件名包含模式（glob）
+    :param exclude: 文件名和目录名排除模式（glob）
+    :param workers: 并发扫描线程数
+    :param rename_workers: 并发重命名线程数
+    :param journal: 重命名日志，用于中断后恢复或撤销
+    :param index: 扫描索引，提供时只处理上次运行之后新出现的文件以及上次未能重命名的文件
+    """
+    if not target_path.exists():
+        logging.error("错误: 目录 '%s' 不存在，请检查路径是否正确", target_path)
+        return
+
+    if not target_path.is_dir():
+        logging.error("错误: '%s' 不是一个目录", target_path)
+        return
+
+    processed_files = 0
+    conversion_list = []
+    search, build = _rule_functions(DEFAULT_RULE)
+
+    logging.info("开始处理: %s", target_path)
+
+    for entry in walk_files(
+        target_path,
+        recursive=recursive,
+        max_depth=max_depth,
+        include=include,
+        exclude=exclude,
+        workers=workers,
+        index=index,
+        index_key=DEFAULT_RULE.match_pattern,
+    ):
+        processed_files += 1
+        match = search(entry.name)
+        if not match:
+            logging.debug("文件 '%s' 不符合命名格式，已跳过", entry.name, extra=_LOG_UNMATCHED)
+            continue
+        if index is not None:
+            index.forget(entry.path)
+        try:
+            conversion_list.append((entry, build(entry.name, match)))
+        except ValueError as e:
+            logging.error("格式错误: %s，文件 '%s' 已跳过", e, entry.name, extra=_LOG_FAILED)
+            if _run_stats is not None:
+                _run_stats.count("errors")
+
+    if _run_stats is not None:
+        _run_stats.count("conversions", len(conversion_list))
+    renamed_files = perform_conversions(
+        conversion_list, workers=rename_workers, journal=journal
+    )
+
+    logging.info(
+        "处理完成: 共处理 %s 个文件，成功重命名 %s 个文件", processed_files, renamed_files
+    )
+
+
+def process_single_file(
+    file_path: Path, rule: Optional[ConversionRule] = None
+) -> bool:
+    """
+    处理单个文件，检查并转换文件名中的中文数字
+    :param file_path: 文件路径
+    :param rule: 转换规则，默认使用DEFAULT_RULE
+    :return: 如果文件被成功重命名则返回True，否则返回False
+    """
+    rule = rule or DEFAULT_RULE
+    match = rule.search(file_path.name)
+    if not match:
+        logging.debug("文件 '%s' 不符合命名格式，已跳过", file_path.name, extra=_LOG_UNMATCHED)
+        return False
+
+    try:
+        new_name = rule.build(file_path.name, match)
+
+        if new_name == file_path.name:
+            logging.warning(
+                "警告: 文件名 '%s' 未发生变化，已跳过", file_path.name, extra=_LOG_UNCHANGED
+            )
+            return False
+
+        new_path = file_path.parent / new_name
+
+        if not file_path.exists():
+            logging.error("错误: 文件 '%s' 不存在，已跳过", file_path, extra=_LOG_FAILED)
+            return False
+
+        if new_path.exists():
+            logging.error(
+                "错误: 新文件名 '%s' 已存在，文件 '%s' 已跳过",
+                new_name,
+                file_path.name,
+                extra=_LOG_FAILED,
+            )
+            return False
+
+        file_path.rename(new_path)
+        logging.info("成功重命名: %s -> %s", file_path.name, new_name, extra=_LOG_RENAMED)
+        return True
+
+    except ValueError as e:
+        logging.error("格式错误: %s，文件 '%s' 已跳过", e, file_path.name, extra=_LOG_FAILED)
+        return False
+    except Exception as e:
+        logging.error("处理文件 '%s' 时出错: %s", file_path.name, e, extra=_LOG_FAILED)
+        return False
+
+
+# inotify事件掩码（见inotify(7)）
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+# 文件写入完成或被移入时处理；新建目录时（递归模式）添加监视
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_ONLYDIR
+
+
+class _InotifyWatcher:
+    """
+    基于inotify的目录监视器（仅Linux，通过ctypes调用libc，无需第三方依赖）
+
+    只报告写入完成（IN_CLOSE_WRITE）和移入（IN_MOVED_TO）的文件，
+    避免处理仍在写入中的文件；递归模式下自动监视新建的子目录。
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_depth: Optional[int],
+        include: Optional["re.Pattern[str]"],
+        exclude: Optional["re.Pattern[str]"],
+    ) -> None:
+        import ctypes
+        import ctypes.util
+        import struct
+
+        # struct inotify_event的固定部分：wd、mask、cookie、len
+        self._event = struct.Struct("iIII")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._max_depth = max_depth
+        self._include = include
+        self._exclude = exclude
+        self._dirs: Dict[int, Tuple[str, int]] = {}
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1失败")
+        try:
+            self._add_tree(root, 0, report=False)
+        except BaseException:
+            self.close()
+            raise
+
+    def _add_watch(self, path: str, depth: int) -> None:
+        """监视单个目录，超出系统监视数量上限时抛出OSError"""
+        import ctypes
+
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"无法监视目录 '{path}': {os.strerror(errno)}")
+        self._dirs[wd] = (path, depth)
+
+    def _add_tree(self, path: str, depth: int, report: bool) -> List[str]:
+        """
+        监视目录及其子目录（受最大深度和排除模式限制）
+        :param report: 为True时返回目录中已有的文件（新建目录在添加监视前可能已写入文件）
+        """
+        found = []
+        pending = [(path, depth)]
+        while pending:
+            current, level = pending.pop()
+            self._add_watch(current, level)
+            if not report and self._max_depth == 0:
+                continue
+            descend = self._max_depth is None or level < self._max_depth
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if descend and (
+                                self._exclude is None or not self._exclude.match(entry.name)
+                            ):
+                                pending.append((entry.path, level + 1))
+                        elif report and self._accepts(entry.name):
+                            found.append(entry.path)
+            except OSError as e:
+                logging.warning("无法扫描目录 '%s': %s，已跳过", current, e)
+        return found
+
+    def _accepts(self, name: str) -> bool:
+        """文件名是否符合包含/排除模式"""
+        return (self._exclude is None or not self._exclude.match(name)) and (
+            self._include is None or self._include.match(name)
+        )
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self, timeout: Optional[float]) -> Optional[List[str]]:
+        """
+        等待并读取事件
+        :param timeout: 最长等待时间（秒），None表示一直等待
+        :return: 新出现的文件路径列表；事件队列溢出时返回None，调用方应重新扫描
+        """
+        import select
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        paths = []
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._event.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + 16 : offset + 16 + length].rstrip(b"\0"))
+                offset += 16 + length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._dirs.get(wd)
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if directory is None or not name:
+                    continue
+                parent, depth = directory
+                path = os.path.join(parent, name)
+                if mask & _IN_ISDIR:
+                    # 新建或移入的子目录：添加监视，并补报其中已有的文件
+                    if (
+                        mask & (_IN_CREATE | _IN_MOVED_TO)
+                        and (self._max_depth is None or depth < self._max_depth)
+                        and (self._exclude is None or not self._exclude.match(name))
+                    ):
+                        try:
+                            paths.extend(self._add_tree(path, depth + 1, report=True))
+                        except OSError as e:
+                            logging.warning("%s", e)
+                elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO) and self._accepts(name):
+                    paths.append(path)
+        return None if overflow else paths
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingWatcher:
+    """
+    轮询方式的目录监视器（inotify不可用时使用）
+
+    每隔poll_interval秒扫描一次目录树，与上次的文件列表比较，报告新出现的文件。
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_depth: Optional[int],
+        include: Optional["re.Pattern[str]"],
+        exclude: Optional["re.Pattern[str]"],
+        poll_interval: float,
+    ) -> None:
+        self._root = root
+        self._max_depth = max_depth
+        self._include = include
+        self._exclude = exclude
+        self._interval = poll_interval
+        self._next_poll = time.monotonic() + poll_interval
+        self._known = self._snapshot()
+
+    def _snapshot(self) -> set:
+        """扫描目录树，返回所有符合条件的文件路径"""
+        paths = set()
+        pending = [(self._root, 0)]
+        while pending:
+            directory, depth = pending.pop()
+            # 轮询不计入运行统计
+            try:
+                files, subdirs = _scan_directory(
+                    directory,
+                    depth,
+                    self._max_depth,
+                    self._include,
+                    self._exclude,
+                    record_stats=False,
+                )
+            except OSError as e:
+                # 每次轮询都会遇到，只在调试日志中记录
+                logging.debug("无法扫描目录 '%s': %s，已跳过", directory, e)
+                continue
+            paths.update(entry.path for entry in files)
+            pending.extend(subdirs)
+        return paths
+
+    def read(self, timeout: Optional[float]) -> Optional[List[str]]:
+        """
+        等待到下一次轮询时间（不超过timeout）并返回新出现的文件
+        :param timeout: 最长等待时间（秒），None表示等到下一次轮询
+        :return: 新出现的文件路径列表
+        """
+        wait = max(0.0, self._next_poll - time.monotonic())
+        if timeout is not None and timeout < wait:
+            time.sleep(timeout)
+            return []
+        time.sleep(wait)
+        self._next_poll = time.monotonic() + self._interval
+        current = self._snapshot()
+        new_paths = sorted(current - self._known)
+        self._known = current
+        return new_paths
+
+    def close(self) -> None:
+        pass
+
+
+def _open_watcher(
+    root: str,
+    max_depth: Optional[int],
+    include: Optional["re.Pattern[str]"],
+    exclude: Optional["re.Pattern[str]"],
+    poll_interval: float,
+    force_polling: bool,
+):
+    """创建目录监视器：优先使用inotify，不可用时退回轮询"""
+    import sys
+
+    if not force_polling and sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher(root, max_depth, include, exclude)
+        except (OSError, AttributeError) as e:
+            logging.warning("inotify不可用（%s），改为每 %s 秒轮询", e, poll_interval)
+    return _PollingWatcher(root, max_depth, include, exclude, poll_interval)
+
+
+def watch_directory(
+    target_path: Path,
+    recursive: bool = False,
+    max_depth: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    rule: Optional[ConversionRule] = None,
+    debounce: float = 0.2,
+    poll_interval: float = 0.5,
+    stop: Optional[threading.Event] = None,
+    force_polling: bool = False,
+    on_ready: Optional[Callable[[], None]] = None,
+) -> int:
+    """
+    持续监视目录，只转换新写入或移入的文件，不再重复扫描整个目录
+
+    同一文件的多个事件在debounce秒内合并为一次处理，到期的文件批量交给
+    process_single_file；没有事件时阻塞等待，空闲时几乎不占用CPU。
+    监视开始之前已存在的文件不会被处理；需要处理时通过on_ready调用process_files，
+    它在监视建立之后执行，期间新出现的文件同样会被捕获（重复的事件由防抖合并，
+    已处理过的文件不再符合规则，不会被重复转换）。
+    :param target_path: 目标目录路径
+    :param recursive: 是否监视子目录（包括之后新建的子目录）
+    :param max_depth: 最大递归深度，None表示不限制
+    :param include: 文件名包含模式（glob）
+    :param exclude: 文件名和目录名排除模式（glob）
+    :param rule: 转换规则，默认使用DEFAULT_RULE
+    :param debounce: 文件最后一次事件之后等待的秒数
+    :param poll_interval: 轮询模式下的扫描间隔（秒）
+    :param stop: 停止标志，设置后最迟约1秒内返回
+    :param force_polling: 为True时不使用inotify
+    :param on_ready: 监视建立之后、开始处理事件之前调用，用于处理已存在的文件
+    :return: 成功重命名的文件数量
+    """
+    root = os.fspath(target_path)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(f"'{root}' 不是一个目录")
+    if not recursive:
+        max_depth = 0
+    watcher = _open_watcher(
+        root,
+        max_depth,
+        _compile_globs(include),
+        _compile_globs(exclude),
+        poll_interval,
+        force_polling,
+    )
+    logging.info("开始监视: %s", root)
+
+    pending: Dict[str, float] = {}
+    renamed = 0
+    try:
+        if on_ready is not None:
+            on_ready()
+        while stop is None or not stop.is_set():
+            # 有待处理的文件时等到最早的防抖期满，否则最多等待1秒以便响应停止标志
+            timeout = 1.0
+            if pending:
+                timeout = max(0.0, min(pending.values()) + debounce - time.monotonic())
+            paths = watcher.read(timeout)
+            now = time.monotonic()
+            if paths is None:
+                # 事件丢失，重新扫描整个目录树
+                logging.warning("监视事件队列溢出，重新扫描: %s", root)
+                paths = [
+                    entry.path
+                    for entry in walk_files(
+                        root,
+                        recursive=recursive,
+                        max_depth=max_depth,
+                        include=include,
+                        exclude=exclude,
+                    )
+                ]
+            for path in paths:
+                pending[path] = now
+
+            due = sorted(path for path, seen in pending.items() if now - seen >= debounce)
+            for path in due:
+                del pending[path]
+                # 防抖期间文件可能已被移走或删除
+                if os.path.isfile(path) and process_single_file(Path(path), rule):
+                    renamed += 1
+    finally:
+        watcher.close()
+        logging.info("停止监视: %s，共重命名 %s 个文件", root, renamed)
+    return renamed
+
+
+def exit_with_error(message: str, exit_code: int = 1) -> NoReturn:
+    """
+    输出错误消息并退出程序
+    :param message: 错误消息
+    :param exit_code: 退出码
+    """
+    logging.error(message)
+    exit(exit_code)
+
+
+# 汇总模式中各结果的显示名称
+OUTCOME_LABELS = {
+    "renamed": "成功重命名",
+    "undone": "已撤销",
+    "failed": "失败",
+    "unchanged": "未变化",
+    "unmatched": "不符合命名格式",
+}
+
+
+class OutcomeSummary(logging.Filter):
+    """
+    汇总模式的日志过滤器：拦截带结果标记的逐文件日志，只按结果计数
+
+    安装在根logger上，被拦截的记录不会进入处理器，也不会被格式化。
+    只统计已启用级别的日志（如"不符合命名格式"只在DEBUG级别下计数）。
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        outcome = getattr(record, "outcome", None)
+        if outcome is None:
+            return True
+        with self._lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        return False
+
+    def summary(self) -> str:
+        """
+        生成汇总文本
+        :return: 如"成功重命名 10, 失败 2"，没有记录时为"无"
+        """
+        with self._lock:
+            counts = dict(self.counts)
+        return ", ".join(
+            f"{OUTCOME_LABELS.get(outcome, outcome)} {n}" for outcome, n in counts.items()
+        ) or "无"
+
+
+class _DeferredQueueHandler(logging.Handler):
+    """
+    只把日志记录放入队列的处理器，格式化和输出全部由后台线程完成
+
+    标准库的QueueHandler会在调用线程中预先格式化消息，这里直接入队原始记录；
+    记录只在进程内传递，参数对象保持有效。
+    """
+
+    def __init__(self, queue) -> None:
+        super().__init__()
+        self.queue = queue
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.queue.put_nowait(record)
+
+
+# 异步日志的后台线程和汇总过滤器，由configure_logging创建
+_log_listener = None
+_log_summary: Optional[OutcomeSummary] = None
+
+
+def configure_logging(
+    verbose: bool = False, asynchronous: bool = False, summary: bool = False
+) -> None:
+    """
+    配置日志系统
+    :param verbose: 如果为True，则启用DEBUG级别日志
+    :param asynchronous: 如果为True，日志记录放入队列后立即返回，由后台线程格式化并输出
+    :param summary: 如果为True，逐文件的结果日志只计数，结束时（shutdown_logging）输出汇总
+    """
+    global _log_listener, _log_summary
+    log_level = logging.DEBUG if verbose else logging.INFO
+    log_format = "%(asctime)s - %(levelname)s - %(message)s"
+    date_format = "%Y-%m-%d %H:%M:%S"
+    if not asynchronous and not summary:
+        logging.basicConfig(level=log_level, format=log_format, datefmt=date_format)
+        return
+
+    import atexit
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(log_format, date_format))
+    if asynchronous:
+        import queue
+        from logging.handlers import QueueListener
+
+        log_queue = queue.SimpleQueue()
+        _log_listener = QueueListener(log_queue, handler)
+        _log_listener.start()
+        handler = _DeferredQueueHandler(log_queue)
+    logging.basicConfig(level=log_level, handlers=[handler])
+    if summary:
+        _log_summary = OutcomeSummary()
+        logging.getLogger().addFilter(_log_summary)
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    输出汇总模式的结果统计，并等待后台日志线程输出全部剩余日志
+    可重复调用，未启用异步或汇总模式时不做任何操作
+    """
+    global _log_listener, _log_summary
+    if _log_summary is not None:
+        logging.getLogger().removeFilter(_log_summary)
+        logging.info("结果汇总: %s", _log_summary.summary())
+        _log_summary = None
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def iter_conversions(
+    folder_path,
+    match_pattern: str = r"第{cn_num}",
+    replace_pattern: str = r"{an_num}",
+    recursive: bool = False,
+    max_depth: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    workers: int = DEFAULT_SCAN_WORKERS,
+    index: Optional[ScanIndex] = None,
+    cancel: Optional[threading.Event] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    reverse: bool = False,
+) -> Iterator[Tuple[os.DirEntry, str]]:
+    """
+    逐个产出文件转换预览，边扫描边匹配，不在内存中保存完整列表
+
+    Args:
+        folder_path: 目标文件夹路径
+        match_pattern: 匹配模式，包含{cn_num}占位符表示中文数字位置
+        replace_pattern: 替换模式，包含{an_num}占位符表示阿拉伯数字位置
+        recursive: 是否递归遍历子目录
+        max_depth: 最大递归深度，None表示不限制
+        include: 文件名包含模式（glob）
+        exclude: 文件名和目录名排除模式（glob）
+        workers: 并发扫描线程数
+        index: 扫描索引，提供时只评估上次扫描之后新出现的文件（扫描时即更新索引，
+               符合规则的文件会移出索引，以便未能重命名时下次重新处理）
+        cancel: 取消标志，设置后停止扫描并结束迭代
+        progress: 进度回调，参数为(已扫描文件数, 已匹配文件数)，每PROGRESS_INTERVAL个文件调用一次
+        reverse: 为True时将阿拉伯数字转换为中文数字（此时match_pattern包含{an_num}，
+                 replace_pattern包含{cn_num}）
+
+    Returns:
+        (原文件entry, 新文件名)元组的迭代器
+    """
+    rule = compile_rule(match_pattern, replace_pattern, reverse)
+    search, build = _rule_functions(rule)
+    scanned = 0
+    matched = 0
+
+    for entry in walk_files(
+        folder_path,
+        recursive=recursive,
+        max_depth=max_depth,
+        include=include,
+        exclude=exclude,
+        workers=workers,
+        index=index,
+        index_key=f"{match_pattern}\0{replace_pattern}"
+        + ("\0reverse" if reverse else ""),
+        cancel=cancel,
+    ):
+        scanned += 1
+        if not scanned % PROGRESS_INTERVAL:
+            if cancel is not None and cancel.is_set():
+                break
+            if progress is not None:
+                progress(scanned, matched)
+        match = search(entry.name)
+        if match:
+            if index is not None:
+                index.forget(entry.path)
+            try:
+                new_name = build(entry.name, match)
+            except ValueError as e:
+                logging.warning(
+                    "无法转换数字: %s, 错误: %s", match.group(1), e, extra=_LOG_FAILED
+                )
+                if _run_stats is not None:
+                    _run_stats.count("errors")
+                continue
+            matched += 1
+            yield entry, new_name
+
+    if progress is not None:
+        progress(scanned, matched)
+    if _run_stats is not None:
+        _run_stats.count("conversions", matched)
+
+
+def iter_conversion_chunks(
+    folder_path, chunk_size: int = 1000, **kwargs
+) -> Iterator[List[Tuple[os.DirEntry, str]]]:
+    """
+    按固定大小分块产出文件转换预览，便于调用方边扫描边显示或重命名
+    :param folder_path: 目标文件夹路径
+    :param chunk_size: 每块最多包含的转换条目数
+    :param kwargs: 传递给iter_conversions的其余参数
+    :return: 转换列表块的迭代器，每块是(原文件entry, 新文件名)元组的列表
+    """
+    if chunk_size <= 0:
+        raise ValueError("分块大小必须大于0")
+    chunk = []
+    for item in iter_conversions(folder_path, **kwargs):
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def preview_conversions(
+    folder_path,
+    match_pattern=r"第{cn_num}",
+    replace_pattern=r"{an_num}",
+    recursive=False,
+    max_depth=None,
+    include=None,
+    exclude=None,
+    workers=DEFAULT_SCAN_WORKERS,
+    index=None,
+    reverse=False,
+):
+    """
+    预览文件转换效果，返回转换列表但不实际修改文件
+    需要流式处理时请使用iter_conversions或iter_conversion_chunks
+
+    Args:
+        folder_path: 目标文件夹路径
+        match_pattern: 匹配模式，包含{cn_num}占位符表示中文数字位置
+        replace_pattern: 替换模式，包含{an_num}占位符表示阿拉伯数字位置
+        recursive: 是否递归遍历子目录
+        max_depth: 最大递归深度，None表示不限制
+        include: 文件名包含模式（glob）
+        exclude: 文件名和目录名排除模式（glob）
+        workers: 并发扫描线程数
+        index: 扫描索引，提供时只评估上次扫描之后新出现的文件
+        reverse: 为True时将阿拉伯数字转换为中文数字，
+                 如match_pattern='第{an_num}集', replace_pattern='第{cn_num}集'
+
+    Returns:
+        转换列表，每个元素是(原文件entry, 新文件名)的元组
+    """
+    return list(
+        iter_conversions(
+            folder_path,
+            match_pattern=match_pattern,
+            replace_pattern=replace_pattern,
+            recursive=recursive,
+            max_depth=max_depth,
+            include=include,
+            exclude=exclude,
+            workers=workers,
+            index=index,
+            reverse=reverse,
+        )
+    )
+
+
+class RenameStep(NamedTuple):
+    """
+    单个重命名操作
+    source: 原文件路径
+    target: 新文件路径
+    name: 原文件名（用于日志）
+    new_name: 新文件名（用于日志）
+    temporary: 是否为打破循环而移到临时名称的中间步骤
+    """
+
+    source: str
+    target: str
+    name: str
+    new_name: str
+    temporary: bool = False
+
+
+class RenamePlan(NamedTuple):
+    """
+    重命名执行计划
+    chains: 互不依赖的重命名链，链内操作必须按顺序执行
+    skipped: 无法执行的操作及原因
+    """
+
+    chains: List[List[RenameStep]]
+    skipped: List[Tuple[RenameStep, str]]
+
+    def __len__(self) -> int:
+        """计划中实际会重命名的文件数量（不含临时中间步骤）"""
+        return sum(
+            1 for chain in self.chains for step in chain if not step.temporary
+        )
+
+
+class _DirectoryListing:
+    """按目录缓存文件名列表，每个目录只列举一次"""
+
+    def __init__(self) -> None:
+        self._names: Dict[str, set] = {}
+
+    def contains(self, path: str) -> bool:
+        directory, name = os.path.split(path)
+        names = self._names.get(directory)
+        if names is None:
+            try:
+                names = {os.path.normcase(n) for n in os.listdir(directory or ".")}
+            except OSError:
+                names = set()
+            self._names[directory] = names
+        return os.path.normcase(name) in names
+
+
+def _temporary_path(source: str, listing: _DirectoryListing, reserved: set) -> str:
+    """
+    为打破循环生成同目录下不冲突的临时路径
+    :param source: 原文件路径
+    :param listing: 目录列表缓存
+    :param reserved: 计划中已占用的路径（normcase后）
+    :return: 临时文件路径
+    """
+    directory, name = os.path.split(source)
+    counter = 0
+    while True:
+        candidate = os.path.join(directory, f".cn2an-tmp-{counter}-{name}")
+        if not listing.contains(candidate) and os.path.normcase(candidate) not in reserved:
+            reserved.add(os.path.normcase(candidate))
+            return candidate
+        counter += 1
+
+
+def plan_conversions(conversion_list) -> RenamePlan:
+    """
+    为整个转换列表生成安全的执行计划
+
+    - 新文件名与原文件名相同的操作被跳过
+    - 多个文件重命名为同一目标时，只保留第一个
+    - 目标已存在且不会被移走的操作被跳过（每个目录只列举一次，不逐个检查exists）
+    - 目标是其他文件原名的操作排在该文件之后执行
+    - 循环重命名（如A->B, B->A）先将其中一个文件移到临时名称以打破循环
+
+    Args:
+        conversion_list: (原文件entry, 新文件名)元组的列表
+
+    Returns:
+        RenamePlan执行计划
+    """
+    skipped: List[Tuple[RenameStep, str]] = []
+    active: Dict[str, RenameStep] = {}  # normcase(source) -> step
+    by_target: Dict[str, str] = {}  # normcase(target) -> normcase(source)
+
+    for entry, new_name in conversion_list:
+        step = RenameStep(
+            entry.path,
+            os.path.join(os.path.dirname(entry.path), new_name),
+            entry.name,
+            new_name,
+        )
+        source_key = os.path.normcase(step.source)
+        target_key = os.path.normcase(step.target)
+        if source_key == target_key:
+            skipped.append((step, "文件名未发生变化"))
+        elif target_key in by_target:
+            skipped.append((step, "与其他文件的新文件名重复"))
+        elif source_key in active:
+            skipped.append((step, "重复的转换条目"))
+        else:
+            active[source_key] = step
+            by_target[target_key] = source_key
+
+    # 目标已被不会移走的文件占用：跳过该操作，并连带跳过以其原名为目标的操作
+    listing = _DirectoryListing()
+    blocked = [
+        source_key
+        for source_key, step in active.items()
+        if os.path.normcase(step.target) not in active and listing.contains(step.target)
+    ]
+    while blocked:
+        source_key = blocked.pop()
+        step = active.pop(source_key, None)
+        if step is None:
+            continue
+        del by_target[os.path.normcase(step.target)]
+        skipped.append((step, "新文件名已存在"))
+        waiting = by_target.get(source_key)
+        if waiting is not None:
+            blocked.append(waiting)
+
+    # 目标唯一，依赖关系只可能构成简单链或环
+    successor = {
+        source_key: os.path.normcase(step.target)
+        for source_key, step in active.items()
+        if os.path.normcase(step.target) in active
+    }
+    chains: List[List[RenameStep]] = []
+    visited = set()
+
+    for source_key, step in active.items():
+        if source_key in successor:
+            continue
+        # 链尾：目标空闲，从链尾向前依次执行
+        chain = []
+        current: Optional[str] = source_key
+        while current is not None:
+            visited.add(current)
+            chain.append(active[current])
+            current = by_target.get(current)
+        chains.append(chain)
+
+    reserved = set(by_target)
+    for source_key, step in active.items():
+        if source_key in visited:
+            continue
+        # 剩余的均在环中：先移走环中一个文件，再依次执行，最后从临时名称移到目标
+        temp_path = _temporary_path(step.source, listing, reserved)
+        chain = [
+            RenameStep(
+                step.source, temp_path, step.name, os.path.basename(temp_path), True
+            )
+        ]
+        visited.add(source_key)
+        current = by_target[source_key]
+        while current != source_key:
+            visited.add(current)
+            chain.append(active[current])
+            current = by_target[current]
+        chain.append(
+            RenameStep(temp_path, step.target, step.name, step.new_name)
+        )
+        chains.append(chain)
+
+    return RenamePlan(chains, skipped)
+
+
+class RenameJournal:
+    """
+    追加写入的重命名日志（JSON Lines格式）
+
+    执行前写入完整计划并立即刷盘，执行过程中的完成记录按批写入，
+    每批只调用一次fsync。进程中断后可据此恢复执行或撤销已完成的重命名。
+    """
+
+    def __init__(self, path, batch_size: int = 1000, fsync: bool = True) -> None:
+        """
+        :param path: 日志文件路径，已存在时追加写入
+        :param batch_size: 完成记录每累计多少条刷盘一次
+        :param fsync: 刷盘时是否调用os.fsync
+        """
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        self._fsync = fsync
+        import json
+
+        self._dumps = functools.partial(json.dumps, ensure_ascii=False)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RenameJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _append(self, record: Dict[str, object]) -> None:
+        """缓冲一条记录（调用方需持有锁）"""
+        self._buffer.append(self._dumps(record))
+
+    def _flush(self) -> None:
+        """写出缓冲区并刷盘（调用方需持有锁）"""
+        if not self._buffer:
+            return
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def record_plan(self, plan: RenamePlan) -> None:
+        """
+        记录完整的执行计划，写入后立即刷盘
+        :param plan: plan_conversions生成的执行计划
+        """
+        with self._lock:
+            self._append({"op": "begin"})
+            for chain_id, chain in enumerate(plan.chains):
+                for step in chain:
+                    self._append(
+                        {
+                            "op": "plan",
+                            "chain": chain_id,
+                            "src": step.source,
+                            "dst": step.target,
+                            "name": step.name,
+                            "new_name": step.new_name,
+                            "tmp": step.temporary,
+                        }
+                    )
+            self._flush()
+
+    def record_done(self, step: RenameStep) -> None:
+        """
+        记录一次已完成的重命名，按批刷盘
+        :param step: 已完成的重命名操作
+        """
+        with self._lock:
+            self._append({"op": "done", "src": step.source, "dst": step.target})
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def record_undone(self) -> None:
+        """记录日志中的重命名已全部撤销"""
+        with self._lock:
+            self._append({"op": "undone"})
+            self._flush()
+
+    def flush(self) -> None:
+        """立即写出缓冲的记录并刷盘"""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """刷盘并关闭日志文件"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush()
+            self._file.close()
+
+
+def _read_journal(path) -> Tuple[List[List[RenameStep]], set]:
+    """
+    读取重命名日志中最近一次撤销之后的记录
+    :param path: 日志文件路径
+    :return: (按计划顺序排列的重命名链列表, 已完成的(原路径, 新路径)集合)
+    """
+    import json
+
+    chains: Dict[Tuple[int, int], List[RenameStep]] = {}
+    done = set()
+    run = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 进程中断时最后一行可能不完整
+                continue
+            op = record.get("op")
+            if op == "plan":
+                chains.setdefault((run, record["chain"]), []).append(
+                    RenameStep(
+                        record["src"],
+                        record["dst"],
+                        record["name"],
+                        record["new_name"],
+                        record["tmp"],
+                    )
+                )
+            elif op == "done":
+                done.add((record["src"], record["dst"]))
+            elif op == "begin":
+                run += 1
+            elif op == "undone":
+                chains.clear()
+                done.clear()
+    return list(chains.values()), done
+
+
+def resume_journal(
+    path,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    根据日志恢复被中断的重命名，无需重新扫描目录
+    完成记录按批刷盘，因此原路径已不存在且新路径已存在的操作也视为已完成；
+    链中的操作严格按顺序执行，某一步已完成时其之前的步骤必然也已完成
+    （后面的步骤会重新占用前面步骤的原路径，不能逐个判断）。
+    恢复时不会覆盖已存在的文件。
+    :param path: 日志文件路径
+    :param workers: 并发重命名线程数
+    :param progress: 进度回调，参数为(已处理数量, 总数量)
+    :return: 本次成功重命名的文件数量
+    """
+    chains, done = _read_journal(path)
+    pending = []
+    for chain in chains:
+        # 从链尾向前找到最后一个已完成的操作
+        start = 0
+        for position in range(len(chain) - 1, -1, -1):
+            step = chain[position]
+            if (step.source, step.target) in done or (
+                not os.path.lexists(step.source) and os.path.lexists(step.target)
+            ):
+                start = position + 1
+                break
+        if start < len(chain):
+            pending.append(chain[start:])
+
+    logging.info("恢复执行: 剩余 %s 个重命名操作", sum(len(c) for c in pending))
+    with RenameJournal(path) as journal:
+        return execute_plan(
+            RenamePlan(pending, []),
+            workers=workers,
+            progress=progress,
+            journal=journal,
+            overwrite=False,
+        )
+
+
+def undo_journal(path) -> int:
+    """
+    按日志逆序撤销已完成的重命名
+    :param path: 日志文件路径
+    :return: 成功撤销的文件数量
+    """
+    chains, _ = _read_journal(path)
+    undone = 0
+    for chain in reversed(chains):
+        for step in reversed(chain):
+            # 只撤销新路径存在且原路径空闲的操作，避免覆盖文件
+            if not os.path.lexists(step.target) or os.path.lexists(step.source):
+                continue
+            try:
+                os.rename(step.target, step.source)
+                if not step.temporary:
+                    undone += 1
+                    logging.info("已撤销: %s -> %s", step.new_name, step.name, extra=_LOG_UNDONE)
+            except OSError as e:
+                logging.error("撤销失败: %s, 错误: %s", step.new_name, e, extra=_LOG_FAILED)
+
+    with RenameJournal(path) as journal:
+        journal.record_undone()
+    return undone
+
+
+def _run_rename_chain(
+    chain: List[RenameStep],
+    on_done: Optional[Callable[[bool], None]] = None,
+    journal: Optional[RenameJournal] = None,
+    cancel: Optional[threading.Event] = None,
+    overwrite: bool = True,
+) -> int:
+    """
+    按顺序执行一条重命名链，某一步失败时跳过链中剩余的操作
+    :param chain: 重命名链
+    :param on_done: 每处理完一个文件时调用，参数表示是否成功
+    :param journal: 记录完成情况的重命名日志
+    :param cancel: 取消标志，设置后不再开始新的操作（已开始的循环重命名会执行完）
+    :param overwrite: 为False时新路径已存在的操作视为失败，不覆盖文件
+    :return: 成功重命名的文件数量
+    """
+    success_count = 0
+    in_cycle = bool(chain) and chain[0].temporary
+    stats = _run_stats
+    rename = os.rename if stats is None else stats.timed("rename", os.rename)
+    for position, step in enumerate(chain):
+        if cancel is not None and cancel.is_set() and not (in_cycle and position):
+            break
+        try:
+            if not overwrite and os.path.lexists(step.target):
+                raise FileExistsError(f"新文件名已存在: {step.target}")
+            rename(step.source, step.target)
+            if journal is not None:
+                journal.record_done(step)
+            if step.temporary:
+                logging.debug("临时移动: %s -> %s", step.name, step.new_name)
+                continue
+            success_count += 1
+            logging.info("已转换: %s -> %s", step.name, step.new_name, extra=_LOG_RENAMED)
+            if on_done is not None:
+                on_done(True)
+        except Exception as e:
+            logging.error("转换失败: %s, 错误: %s", step.name, e, extra=_LOG_FAILED)
+            if stats is not None:
+                stats.count("errors")
+            if on_done is not None and not step.temporary:
+                on_done(False)
+            # 环中第一步已移到临时名称时，该文件会保留为临时名称
+            stranded = chain[0].target if chain[0].temporary and position > 0 else None
+            for skipped in chain[position + 1 :]:
+                if skipped.temporary:
+                    continue
+                if skipped.source != stranded:
+                    logging.error(
+                        "转换失败: %s, 错误: 依赖的重命名未完成，已跳过",
+                        skipped.name,
+                        extra=_LOG_FAILED,
+                    )
+                else:
+                    logging.error(
+                        "转换失败: %s, 错误: 循环重命名中断，文件保留为临时名称 '%s'",
+                        skipped.name,
+                        skipped.source,
+                        extra=_LOG_FAILED,
+                    )
+                if on_done is not None:
+                    on_done(False)
+            break
+    return success_count
+
+
+def execute_plan(
+    plan: RenamePlan,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None,
+    journal: Optional[RenameJournal] = None,
+    cancel: Optional[threading.Event] = None,
+    overwrite: bool = True,
+) -> int:
+    """
+    执行重命名计划
+    :param plan: plan_conversions生成的执行计划
+    :param workers: 并发重命名线程数，大于1时互不依赖的链并发执行
+    :param progress: 进度回调，参数为(已处理数量, 总数量)，可能在工作线程中调用
+    :param journal: 记录完成情况的重命名日志
+    :param cancel: 取消标志，设置后不再开始新的重命名
+    :param overwrite: 为False时不覆盖执行时已存在的文件
+    :return: 成功重命名的文件数量
+    """
+    chains = plan.chains
+    total = len(plan)
+    processed = 0
+    lock = threading.Lock()
+
+    def on_done(success: bool) -> None:
+        nonlocal processed
+        with lock:
+            processed += 1
+            done = processed
+        progress(done, total)
+
+    callback = on_done if progress is not None else None
+
+    def run(chain: List[RenameStep]) -> int:
+        return _run_rename_chain(chain, callback, journal, cancel, overwrite)
+
+    if workers <= 1 or len(chains) <= 1:
+        success_count = sum(map(run, chains))
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="cn2an-rename"
+        ) as pool:
+            success_count = sum(pool.map(run, chains))
+
+    if cancel is not None and cancel.is_set():
+        logging.warning("重命名已取消: 已成功重命名 %s 个文件", success_count)
+    if _run_stats is not None:
+        _run_stats.count("renames", success_count)
+    return success_count
+
+
+def perform_conversions(
+    conversion_list,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None,
+    journal: Optional[RenameJournal] = None,
+    cancel: Optional[threading.Event] = None,
+):
+    """
+    执行文件转换，实际修改文件名
+
+    执行前通过plan_conversions检查重名冲突并确定安全的执行顺序；
+    workers大于1时，互不依赖的重命名链由线程池并发执行。
+
+    Args:
+        conversion_list: 由preview_conversions返回的转换列表
+        workers: 并发重命名线程数
+        progress: 进度回调，参数为(已处理数量, 总数量)，可能在工作线程中调用
+        journal: 重命名日志，用于中断后恢复或撤销
+        cancel: 取消标志，设置后不再开始新的重命名
+
+    Returns:
+        成功转换的文件数量
+    """
+    plan = _prepare_plan(conversion_list, journal)
+    return execute_plan(
+        plan, workers=workers, progress=progress, journal=journal, cancel=cancel
+    )
+
+
+def _prepare_plan(
+    conversion_list, journal: Optional[RenameJournal] = None
+) -> RenamePlan:
+    """
+    生成执行计划，记录被跳过的转换，并将计划写入重命名日志
+    :param conversion_list: 转换列表
+    :param journal: 重命名日志
+    :return: 执行计划
+    """
+    plan = plan_conversions(conversion_list)
+    for step, reason in plan.skipped:
+        logging.error(
+            "转换失败: %s -> %s, 错误: %s，已跳过",
+            step.name,
+            step.new_name,
+            reason,
+            extra=_LOG_FAILED,
+        )
+    if plan.skipped and _run_stats is not None:
+        _run_stats.count("errors", len(plan.skipped))
+    if journal is not None:
+        journal.record_plan(plan)
+    return plan
+
+
+async def aiter_conversions(
+    folder_path,
+    *,
+    chunk_size: int = 256,
+    max_chunks: int = 4,
+    executor: Optional["concurrent.futures.Executor"] = None,
+    **kwargs,
+) -> AsyncIterator[Tuple[os.DirEntry, str]]:
+    """
+    异步产出文件转换预览，扫描在后台线程中进行，不阻塞事件循环
+
+    扫描结果按块经有界缓冲区传给事件循环：缓冲区已满（消费者跟不上扫描）时，
+    扫描线程暂停等待，内存占用不超过max_chunks * chunk_size个条目。
+    提前结束迭代（break、异常或任务取消）时停止后台扫描。
+    :param folder_path: 目标文件夹路径
+    :param chunk_size: 每块的转换条目数
+    :param max_chunks: 缓冲区最多容纳的块数
+    :param executor: 运行扫描的执行器，默认为本次迭代创建单线程执行器
+    :param kwargs: 传递给iter_conversions的其余参数（cancel除外）
+    :return: (原文件entry, 新文件名)元组的异步迭代器
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    if max_chunks <= 0:
+        raise ValueError("缓冲块数必须大于0")
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue" = asyncio.Queue()
+    slots = threading.Semaphore(max_chunks)
+    cancel = threading.Event()
+    finished = object()
+
+    def produce() -> None:
+        try:
+            for chunk in iter_conversion_chunks(
+                folder_path, chunk_size=chunk_size, cancel=cancel, **kwargs
+            ):
+                # 缓冲区已满时在扫描线程中等待，定期检查是否已被取消
+                while not slots.acquire(timeout=0.1):
+                    if cancel.is_set():
+                        return
+                if cancel.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+    owned = executor is None
+    if owned:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cn2an-async-scan")
+    producer = loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is finished:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            slots.release()
+            for item in chunk:
+                yield item
+    finally:
+        cancel.set()
+        await asyncio.shield(producer)
+        if owned:
+            executor.shutdown(wait=False)
+
+
+async def aperform_conversions(
+    conversion_list,
+    concurrency: int = 4,
+    progress: Optional[Callable[[int, int], None]] = None,
+    journal: Optional[RenameJournal] = None,
+    cancel: Optional[threading.Event] = None,
+    executor: Optional["concurrent.futures.Executor"] = None,
+) -> int:
+    """
+    异步执行文件转换，规划和重命名都在执行器中进行，不阻塞事件循环
+
+    与perform_conversions相同，先生成执行计划，再以重命名链为单位执行；
+    同时执行的链数由信号量限制，任务按需创建，不会为每条链预先创建协程。
+    任务被取消时不再开始新的重命名，并等待已开始的链（包括循环重命名）执行完
+    再抛出CancelledError，返回后不会再有重命名或日志写入。
+    :param conversion_list: 由preview_conversions或aiter_conversions得到的转换列表
+    :param concurrency: 同时执行的重命名链数
+    :param progress: 进度回调，参数为(已处理数量, 总数量)，在执行器线程中调用
+    :param journal: 重命名日志，用于中断后恢复或撤销
+    :param cancel: 取消标志，设置后不再开始新的重命名
+    :param executor: 执行重命名的执行器，默认创建concurrency个线程的执行器
+    :return: 成功重命名的文件数量
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    if concurrency <= 0:
+        raise ValueError("并发数必须大于0")
+    loop = asyncio.get_running_loop()
+    owned = executor is None
+    if owned:
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="cn2an-async-rename"
+        )
+    stop = cancel if cancel is not None else threading.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = set()
+    # 已提交给执行器的操作：执行器中的操作无法中断，取消时也要等它们结束
+    started = []
+    chain_futures = []
+
+    try:
+        plan_future = loop.run_in_executor(
+            executor, _prepare_plan, list(conversion_list), journal
+        )
+        started.append(plan_future)
+        plan = await asyncio.shield(plan_future)
+        total = len(plan)
+        processed = 0
+        lock = threading.Lock()
+
+        def on_done(success: bool) -> None:
+            nonlocal processed
+            with lock:
+                processed += 1
+                done = processed
+            progress(done, total)
+
+        callback = on_done if progress is not None else None
+
+        async def run(chain: List[RenameStep]) -> None:
+            future = loop.run_in_executor(
+                executor, _run_rename_chain, chain, callback, journal, stop
+            )
+            started.append(future)
+            chain_futures.append(future)
+            try:
+                # 取消任务时不取消执行器中的链
+                await asyncio.shield(future)
+            finally:
+                semaphore.release()
+
+        for chain in plan.chains:
+            await semaphore.acquire()
+            if stop.is_set():
+                semaphore.release()
+                break
+            task = asyncio.ensure_future(run(chain))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        stop.set()
+        raise
+    finally:
+        if started:
+            # 等待已开始的重命名链结束，避免文件停留在临时名称或在返回后写入日志
+            await asyncio.shield(asyncio.gather(*started, return_exceptions=True))
+        if owned:
+            executor.shutdown(wait=False)
+        success_count = sum(future.result() for future in chain_futures)
+        if stop.is_set():
+            logging.warning("重命名已取消: 已成功重命名 %s 个文件", success_count)
+        if _run_stats is not None:
+            _run_stats.count("renames", success_count)
+    return success_count
+
+
+if __name__ == "__main__":
+    # 保留命令行功能
+    import argparse
+
+    # 从config导入版本信息
+    from config import __version__
+
+    parser = argparse.ArgumentParser(
+        description=f"{__version__}中文数字文件名转换工具 v{__version__}"
+    )
+    parser.add_argument("--path", default=".", help="目标目录路径")
+    parser.add_argument("-r", "--recursive", action="store_true", help="递归处理子目录")
+    parser.add_argument(
+        "--max-depth", type=int, default=None, help="最大递归深度（根目录为0）"
+    )
+    parser.add_argument(
+        "--include", action="append", default=None, help="仅处理匹配该glob的文件，可多次指定"
+    )
+    parser.add_argument(
+        "--exclude", action="append", default=None, help="跳过匹配该glob的文件或目录，可多次指定"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_SCAN_WORKERS, help="并发扫描线程数"
+    )
+    parser.add_argument(
+        "--rename-workers", type=int, default=1, help="并发重命名线程数"
+    )
+    parser.add_argument(
+        "--index", default=None, help="扫描索引文件路径，只处理上次运行后新出现的文件"
+    )
+    parser.add_argument("--journal", default=None, help="将重命名记录写入该日志文件")
+    parser.add_argument("--resume", default=None, help="根据日志文件恢复被中断的重命名")
+    parser.add_argument("--undo", default=None, help="根据日志文件撤销已完成的重命名")
+    parser.add_argument(
+        "--cache-size", type=int, default=0, help="中文数字转换缓存容量，0表示不启用"
+    )
+    parser.add_argument(
+        "--cache-policy", choices=CACHE_POLICIES, default="lru", help="缓存淘汰策略"
+    )
+    parser.add_argument(
+        "--prewarm",
+        type=int,
+        default=0,
+        help="启动时用1到N的中文数字预热缓存（未指定--cache-size时也会启用缓存，容量至少为N）",
+    )
+    parser.add_argument(
+        "--table", type=int, default=0, help="用0到N的中文数字查找表加速转换，0表示不启用"
+    )
+    parser.add_argument(
+        "--table-file", default=None, help="查找表文件，存在时直接加载，否则构建后写入"
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="-",
+        default=None,
+        help="运行结束后以JSON输出各阶段的计数、耗时和耗时分布，可指定输出文件（默认标准输出）",
+    )
+    parser.add_argument(
+        "--profile", default=None, help="使用cProfile分析本次运行，并将结果写入该文件"
+    )
+    parser.add_argument(
+        "--watch", action="store_true", help="处理完现有文件后持续监视目录，转换新写入或移入的文件"
+    )
+    parser.add_argument(
+        "--debounce", type=float, default=0.2, help="监视模式下文件最后一次变化后等待的秒数"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.5, help="无法使用inotify时的轮询间隔（秒）"
+    )
+    parser.add_argument(
+        "--poll", action="store_true", help="监视模式下强制使用轮询而不是inotify"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="显示详细日志信息")
+    parser.add_argument(
+        "--async-log", action="store_true", help="由后台线程格式化并输出日志，减少对重命名的影响"
+    )
+    parser.add_argument(
+        "--summary", action="store_true", help="不逐个输出文件结果，结束时按结果汇总计数"
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    text_parser = subparsers.add_parser(
+        "text", help="转换文本文件内容中的中文数字（支持管道）"
+    )
+    text_parser.add_argument(
+        "input", nargs="?", default="-", help="输入文件路径，默认读取标准输入"
+    )
+    text_parser.add_argument(
+        "-o", "--output", default="-", help="输出文件路径，默认写入标准输出"
+    )
+    text_parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="每次读取的字符数"
+    )
+    text_parser.add_argument(
+        "--require-prefix", action="store_true", help="只转换紧跟在'第'之后的中文数字"
+    )
+    text_parser.add_argument(
+        "--min-length", type=int, default=1, help="中文数字的最小长度"
+    )
+    text_parser.add_argument("--encoding", default="utf-8", help="文件编码")
+    text_parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="并行转换的进程数，按行边界分片"
+    )
+
+    scan_parser = subparsers.add_parser(
+        "scan", help="通过mmap扫描UTF-8文件，输出中文数字的字节偏移和数值"
+    )
+    scan_parser.add_argument("input", help="UTF-8文本文件路径")
+    scan_parser.add_argument(
+        "--require-prefix", action="store_true", help="只匹配紧跟在'第'之后的中文数字"
+    )
+    scan_parser.add_argument(
+        "--min-length", type=int, default=1, help="中文数字的最小长度"
+    )
+    scan_parser.add_argument(
+        "--json", action="store_true", help="以JSON Lines格式输出"
+    )
+    args = parser.parse_args()
+
+    configure_logging(args.verbose, asynchronous=args.async_log, summary=args.summary)
+    if args.command == "text":
+        try:
+            converted = convert_file(
+                args.input,
+                args.output,
+                chunk_size=args.chunk_size,
+                require_prefix=args.require_prefix,
+                min_length=args.min_length,
+                encoding=args.encoding,
+                jobs=args.jobs,
+            )
+            logging.info("文本转换完成: 共转换 %s 个中文数字", converted)
+        except Exception as e:
+            exit_with_error(f"程序执行出错: {str(e)}")
+        exit(0)
+
+    if args.command == "scan":
+        import json
+        import sys
+
+        try:
+            write = sys.stdout.write
+            found = 0
+            for span in scan_file_mmap(
+                args.input,
+                require_prefix=args.require_prefix,
+                min_length=args.min_length,
+            ):
+                found += 1
+                if args.json:
+                    write(json.dumps(span._asdict(), ensure_ascii=False) + "\n")
+                else:
+                    write(f"{span.start}\t{span.end}\t{span.text}\t{span.value}\n")
+            sys.stdout.flush()
+            logging.info("扫描完成: 共发现 %s 个中文数字", found)
+        except Exception as e:
+            exit_with_error(f"程序执行出错: {str(e)}")
+        exit(0)
+
+    try:
+        cache = None
+        if args.cache_size > 0 or args.prewarm > 0:
+            cache = enable_cache(
+                args.cache_size or args.prewarm, args.cache_policy, args.prewarm
+            )
+        if args.table > 0 or args.table_file:
+            enable_table(args.table or 100000, args.table_file)
+        stats = enable_stats() if args.stats else None
+        profiler = None
+        if args.profile:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            if args.resume:
+                renamed = resume_journal(args.resume, workers=args.rename_workers)
+                logging.info("恢复完成: 成功重命名 %s 个文件", renamed)
+            elif args.undo:
+                undone = undo_journal(args.undo)
+                logging.info("撤销完成: 成功撤销 %s 个文件", undone)
+            else:
+                def process_existing() -> None:
+                    journal = RenameJournal(args.journal) if args.journal else None
+                    index = ScanIndex(args.index) if args.index else None
+                    try:
+                        process_files(
+                            Path(args.path).resolve(),
+                            recursive=args.recursive,
+                            max_depth=args.max_depth,
+                            include=args.include,
+                            exclude=args.exclude,
+                            workers=args.workers,
+                            rename_workers=args.rename_workers,
+                            journal=journal,
+                            index=index,
+                        )
+                    finally:
+                        if journal is not None:
+                            journal.close()
+                        if index is not None:
+                            index.close()
+
+                if args.watch:
+                    # 先建立监视再处理已有文件，处理期间新出现的文件不会遗漏
+                    try:
+                        watch_directory(
+                            Path(args.path).resolve(),
+                            recursive=args.recursive,
+                            max_depth=args.max_depth,
+                            include=args.include,
+                            exclude=args.exclude,
+                            debounce=args.debounce,
+                            poll_interval=args.poll_interval,
+                            force_polling=args.poll,
+                            on_ready=process_existing,
+                        )
+                    except KeyboardInterrupt:
+                        logging.info("已停止监视")
+                else:
+                    process_existing()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+                logging.info("性能分析结果已写入: %s", args.profile)
+            if stats is not None:
+                import json
+
+                report = json.dumps(stats.as_dict(), ensure_ascii=False, indent=2)
+                if args.stats == "-":
+                    print(report)
+                else:
+                    with open(args.stats, "w", encoding="utf-8") as f:
+                        f.write(report)
+        if cache is not None:
+            logging.info("转换缓存统计: %s", cache.stats())
     except Exception as e:
         exit_with_error(f"程序执行出错: {str(e)}")
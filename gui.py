@@ -1,6 +1,6 @@
 # gui.py
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
+from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
 import config
 from cn2an import process_files, chinese_to_arabic
@@ -8,10 +8,11 @@ import re
 from pathlib import Path
 import logging
 import threading
-from cn2an import preview_conversions, perform_conversions
-import requests
-import webbrowser
-from packaging import version
+import queue
+import time
+from cn2an import iter_conversion_chunks, perform_conversions
+
+# requests、packaging和webbrowser只在检查更新时才导入，以缩短启动时间
 
 # 配置日志
 logging.basicConfig(
@@ -19,6 +20,177 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 预览分块大小及界面刷新间隔
+PREVIEW_CHUNK_SIZE = 500
+PREVIEW_POLL_MS = 50
+# 每次刷新最多合并的分块数，避免单次刷新占用主线程过久
+PREVIEW_CHUNKS_PER_TICK = 20
+# 进度事件的最小间隔（秒）
+PROGRESS_MIN_INTERVAL = 0.1
+
+
+class BackgroundJob:
+    """
+    可取消的后台任务
+
+    任务函数在守护线程中运行并接收任务对象本身，通过cancel_event协作式地检查取消，
+    通过report上报进度计数；进度事件按最小间隔限频后切换回主线程回调。
+    """
+
+    def __init__(
+        self,
+        root: tk.Tk,
+        name: str,
+        target,
+        on_progress=None,
+        min_interval: float = PROGRESS_MIN_INTERVAL,
+    ) -> None:
+        """
+        :param root: Tk根窗口，用于切换回主线程
+        :param name: 任务名称（如'preview'、'rename'）
+        :param target: 任务函数，参数为任务对象
+        :param on_progress: 进度回调，参数为(任务对象, 计数快照)，在主线程中调用
+        :param min_interval: 两次进度回调之间的最小间隔（秒）
+        """
+        self.root = root
+        self.name = name
+        self.cancel_event = threading.Event()
+        self.counters = {}
+        self._target = target
+        self._on_progress = on_progress
+        self._min_interval = min_interval
+        self._started = 0.0
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def start(self) -> None:
+        """在守护线程中启动任务"""
+        self._started = time.monotonic()
+        threading.Thread(target=self._target, args=(self,), daemon=True).start()
+
+    def cancel(self) -> None:
+        """请求取消任务，任务会在下一个检查点停止"""
+        self.cancel_event.set()
+
+    def report(self, force: bool = False, **counters: int) -> None:
+        """
+        更新进度计数，按最小间隔限频通知主线程
+        :param force: 为True时忽略限频立即通知
+        :param counters: 进度计数，如scanned、matched、renamed
+        """
+        self.counters.update(counters)
+        now = time.monotonic()
+        if not force and now - self._last_report < self._min_interval:
+            return
+        self._last_report = now
+        if self._on_progress is not None:
+            snapshot = dict(self.counters)
+            self.root.after(0, self._on_progress, self, snapshot)
+
+
+class VirtualPreviewList(tk.Frame):
+    """
+    虚拟化的转换预览列表
+
+    数据保存在Python列表中，表格只为当前可见的行创建条目，
+    滚动时复用这些条目，因此列表长度不影响界面响应速度。
+    """
+
+    def __init__(self, master: tk.Misc, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self._items: list = []
+        self._offset = 0
+        self._rows = 1
+        row_height = ttk.Style().lookup("Treeview", "rowheight")
+        self._row_height = int(row_height) if row_height else 20
+
+        self.summary_label = tk.Label(self, anchor=tk.W, font=("SimHei", 10))
+        self.summary_label.pack(fill=tk.X, pady=(0, 5))
+
+        body = tk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(
+            body, columns=("source", "target"), show="headings", selectmode="none"
+        )
+        self.tree.heading("source", text="原文件名")
+        self.tree.heading("target", text="新文件名")
+        self.scrollbar = ttk.Scrollbar(
+            body, orient=tk.VERTICAL, command=self._on_scrollbar
+        )
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self._on_configure)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_mousewheel)
+
+    def set_items(self, items: list) -> None:
+        """设置数据列表（保存引用，列表增长后调用refresh即可显示）"""
+        self._items = items
+        self._offset = 0
+        self.refresh()
+
+    def set_summary(self, text: str) -> None:
+        """设置列表上方的摘要文字"""
+        self.summary_label.config(text=text)
+
+    def refresh(self) -> None:
+        """按当前滚动位置重新填充可见行"""
+        total = len(self._items)
+        self._offset = max(0, min(self._offset, total - self._rows))
+        visible = self._items[self._offset : self._offset + self._rows]
+        children = self.tree.get_children()
+        for position, (entry, new_name) in enumerate(visible):
+            values = (entry.name, new_name)
+            if position < len(children):
+                self.tree.item(children[position], values=values)
+            else:
+                self.tree.insert("", tk.END, values=values)
+        if len(children) > len(visible):
+            self.tree.delete(*children[len(visible) :])
+
+        if total:
+            self.scrollbar.set(
+                self._offset / total, min(1.0, (self._offset + self._rows) / total)
+            )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int) -> None:
+        self._offset = offset
+        self.refresh()
+
+    def _on_scrollbar(self, *args: str) -> None:
+        """处理滚动条拖动和点击"""
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._items)))
+        elif args[0] == "scroll":
+            step = self._rows if args[2] == "pages" else 1
+            self._scroll_to(self._offset + int(args[1]) * step)
+
+    def _on_mousewheel(self, event: tk.Event) -> str:
+        """处理鼠标滚轮（Windows/macOS使用delta，Linux使用Button-4/5）"""
+        if getattr(event, "num", None) == 4 or event.delta > 0:
+            self._scroll_to(self._offset - 3)
+        else:
+            self._scroll_to(self._offset + 3)
+        return "break"
+
+    def _on_configure(self, event: tk.Event) -> None:
+        """窗口尺寸变化时重新计算可见行数"""
+        # 减去表头占用的一行高度
+        rows = max(1, event.height // self._row_height - 1)
+        if rows != self._rows:
+            self._rows = rows
+            self.refresh()
+
 
 class MainWindow:
     def __init__(self, root: tk.Tk) -> None:
@@ -30,6 +202,8 @@ class MainWindow:
         self.match_pattern = tk.StringVar()
         self.replace_pattern = tk.StringVar()
         self.conversion_list = []
+        self._preview_queue = None
+        self._job = None
         self.create_widgets()
 
     def create_widgets(self) -> None:
@@ -164,6 +338,14 @@ class MainWindow:
         self.convert_btn.pack(fill=tk.X)
         self.convert_btn.config(state=tk.DISABLED)
 
+        # 进度条和进度信息
+        self.progress_bar = ttk.Progressbar(btn_frame, mode="determinate")
+        self.progress_bar.pack(fill=tk.X, pady=(5, 0))
+        self.progress_label = tk.Label(
+            btn_frame, text="", fg="gray", font=("SimHei", 9), anchor=tk.W
+        )
+        self.progress_label.pack(fill=tk.X)
+
     def _create_preview_list(self) -> None:
         """创建转换预览列表区域的UI组件"""
         # 预览区域独占剩余空间
@@ -174,11 +356,8 @@ class MainWindow:
         list_frame = tk.LabelFrame(preview_container, text="转换清单预览", padx=10, pady=10)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20)
 
-        self.list_text = scrolledtext.ScrolledText(
-            list_frame, wrap=tk.WORD, height=4
-        )
-        self.list_text.pack(fill=tk.BOTH, expand=True)
-        self.list_text.config(state=tk.DISABLED)
+        self.preview_list = VirtualPreviewList(list_frame)
+        self.preview_list.pack(fill=tk.BOTH, expand=True)
 
         # 底部按钮
         confirm_frame = tk.Frame(preview_container, padx=20, pady=15)
@@ -252,65 +431,136 @@ class MainWindow:
             messagebox.showwarning("警告", "替换模式必须包含{an_num}占位符")
             return
 
-        # 使用线程防止UI冻结
+        # 使用后台任务防止UI冻结，扫描结果分块送回主线程显示
         self.convert_btn.config(state=tk.DISABLED)
-        threading.Thread(
-            target=self._generate_preview,
-            args=(folder_path, match_pattern, replace_pattern),
-            daemon=True,
-        ).start()
+        self.reset_interface()
+        self.preview_list.set_summary("正在扫描...")
+        preview_queue = queue.Queue()
+        self._preview_queue = preview_queue
+        self._job = BackgroundJob(
+            self.root,
+            "preview",
+            lambda job: self._generate_preview(
+                job, preview_queue, folder_path, match_pattern, replace_pattern
+            ),
+            on_progress=self._on_job_progress,
+        )
+        self.progress_bar.config(mode="indeterminate")
+        self.progress_bar.start(10)
+        # 扫描过程中允许取消
+        self.cancel_btn.config(state=tk.NORMAL)
+        self._job.start()
+        self.root.after(PREVIEW_POLL_MS, self._poll_preview_queue, preview_queue)
+
+    def _on_job_progress(self, job: BackgroundJob, counters: dict) -> None:
+        """在主线程中显示后台任务进度"""
+        if job is not self._job:
+            return
+        elapsed = max(job.elapsed, 1e-6)
+        if job.name == "preview":
+            scanned = counters.get("scanned", 0)
+            self.progress_label.config(
+                text=f"已扫描 {scanned} 个文件，匹配 {counters.get('matched', 0)} 个，"
+                f"{scanned / elapsed:.0f} 个/秒"
+            )
+        else:
+            renamed = counters.get("renamed", 0)
+            total = counters.get("total", 0)
+            self.progress_bar.config(maximum=max(total, 1), value=renamed)
+            self.progress_label.config(
+                text=f"已处理 {renamed}/{total} 个文件，{renamed / elapsed:.0f} 个/秒"
+            )
 
-    def update_preview_list(self) -> None:
-        self.list_text.config(state=tk.NORMAL)
-        self.list_text.delete(1.0, tk.END)
+    def update_preview_list(self, finished: bool = True) -> None:
+        """刷新预览列表的可见行和摘要"""
+        self.preview_list.refresh()
+        count = len(self.conversion_list)
+        if not finished:
+            self.preview_list.set_summary(f"正在扫描... 已发现 {count} 个可转换文件")
+            return
 
         if not self.conversion_list:
-            self.list_text.insert(tk.END, "没有找到可转换的文件")
-            self.list_text.config(state=tk.DISABLED)
+            self.preview_list.set_summary("没有找到可转换的文件")
+            self.cancel_btn.config(state=tk.DISABLED)
             return
 
-        # 优化列表更新效率
-        preview_content = [f"将转换以下 {len(self.conversion_list)} 个文件:\n\n"]
-        preview_content.extend(
-            [
-                f"{entry.name} -> {new_name}\n"
-                for entry, new_name in self.conversion_list
-            ]
-        )
-        preview_content.append(f"\n共发现 {len(self.conversion_list)} 个可转换文件")
-        self.list_text.insert(tk.END, "".join(preview_content))
-        self.list_text.config(state=tk.DISABLED)
-
+        self.preview_list.set_summary(f"将转换以下 {count} 个文件:")
         # 启用确认和取消按钮
         self.confirm_btn.config(state=tk.NORMAL)
         self.cancel_btn.config(state=tk.NORMAL)
 
+    def _poll_preview_queue(self, preview_queue: queue.Queue) -> None:
+        """在主线程中合并后台线程送回的预览分块"""
+        if preview_queue is not self._preview_queue:
+            # 预览已被取消或重新开始
+            return
+
+        finished = False
+        try:
+            for _ in range(PREVIEW_CHUNKS_PER_TICK):
+                item = preview_queue.get_nowait()
+                if item is None:
+                    finished = True
+                    break
+                if isinstance(item, Exception):
+                    self._preview_queue = None
+                    self._show_preview_error(item)
+                    return
+                self.conversion_list.extend(item)
+        except queue.Empty:
+            pass
+
+        self.update_preview_list(finished)
+        if finished:
+            self._preview_queue = None
+            self._job = None
+            self.progress_bar.stop()
+            self.progress_bar.config(mode="determinate", value=0)
+            self.convert_btn.config(state=tk.NORMAL)
+        else:
+            self.root.after(PREVIEW_POLL_MS, self._poll_preview_queue, preview_queue)
+
+    def _show_preview_error(self, error: Exception) -> None:
+        """显示预览失败信息并重置界面"""
+        if isinstance(error, FileNotFoundError):
+            messagebox.showerror("错误", "文件夹不存在或已被删除")
+        else:
+            messagebox.showerror("错误", f"预览生成失败: {str(error)}")
+        self.reset_interface()
+        self.convert_btn.config(state=tk.NORMAL)
+
     def _generate_preview(
-        self, folder_path: str, match_pattern: str, replace_pattern: str
+        self,
+        job: BackgroundJob,
+        preview_queue: queue.Queue,
+        folder_path: str,
+        match_pattern: str,
+        replace_pattern: str,
     ) -> None:
-        """在后台线程生成转换预览"""
+        """在后台线程生成转换预览，结果分块放入队列"""
         try:
             logger.info(f"开始生成预览: {folder_path}")
-            self.conversion_list = preview_conversions(
+            for chunk in iter_conversion_chunks(
                 folder_path,
+                chunk_size=PREVIEW_CHUNK_SIZE,
                 match_pattern=match_pattern,
                 replace_pattern=replace_pattern,
-            )
-            # 切换回主线程更新UI
-            self.root.after(0, self.update_preview_list)
-            self.root.after(0, lambda: self.convert_btn.config(state=tk.NORMAL))
-        except FileNotFoundError:
+                cancel=job.cancel_event,
+                progress=lambda scanned, matched: job.report(
+                    scanned=scanned, matched=matched
+                ),
+            ):
+                preview_queue.put(chunk)
+            if job.cancelled:
+                logger.info("预览已取消")
+            job.report(force=True)
+            preview_queue.put(None)
+        except FileNotFoundError as e:
             logger.error(f"文件夹不存在: {folder_path}")
-            self.root.after(
-                0, lambda: messagebox.showerror("错误", "文件夹不存在或已被删除")
-            )
-            self.root.after(0, self.reset_interface)
+            preview_queue.put(e)
         except Exception as e:
             logger.error(f"预览生成失败: {str(e)}")
-            self.root.after(
-                0, lambda: messagebox.showerror("错误", f"预览生成失败: {str(e)}")
-            )
-            self.root.after(0, self.reset_interface)
+            preview_queue.put(e)
 
     def confirm_conversion(self) -> None:
         if not self.conversion_list:
@@ -319,22 +569,33 @@ class MainWindow:
 
         # 使用cn2an模块的执行功能
         self.confirm_btn.config(state=tk.DISABLED)
-        self.cancel_btn.config(state=tk.DISABLED)
-        # 使用线程执行转换操作
-        threading.Thread(target=self._perform_conversion, daemon=True).start()
+        self.convert_btn.config(state=tk.DISABLED)
+        # 使用后台任务执行转换操作，执行过程中允许取消
+        self._job = BackgroundJob(
+            self.root,
+            "rename",
+            self._perform_conversion,
+            on_progress=self._on_job_progress,
+        )
+        self.progress_bar.config(mode="determinate", value=0)
+        self._job.start()
 
-    def _perform_conversion(self) -> None:
+    def _perform_conversion(self, job: BackgroundJob) -> None:
         """在后台线程执行文件转换"""
         try:
             logger.info(f"开始转换 {len(self.conversion_list)} 个文件")
-            success_count = perform_conversions(self.conversion_list)
-            logger.info(f"转换完成，成功转换 {success_count} 个文件")
-            self.root.after(
-                0,
-                lambda: messagebox.showinfo(
-                    "完成", f"转换完成，成功转换 {success_count} 个文件"
-                ),
+            success_count = perform_conversions(
+                self.conversion_list,
+                progress=lambda done, total: job.report(renamed=done, total=total),
+                cancel=job.cancel_event,
             )
+            job.report(force=True)
+            if job.cancelled:
+                message = f"转换已取消，成功转换 {success_count} 个文件"
+            else:
+                message = f"转换完成，成功转换 {success_count} 个文件"
+            logger.info(message)
+            self.root.after(0, lambda: messagebox.showinfo("完成", message))
         except PermissionError:
             logger.error("文件权限不足")
             self.root.after(
@@ -349,17 +610,39 @@ class MainWindow:
                 0, lambda: messagebox.showerror("错误", f"转换失败: {str(e)}")
             )
         finally:
-            self.root.after(0, self.reset_interface)
+            self.root.after(0, self._finish_conversion, job)
+
+    def _finish_conversion(self, job: BackgroundJob) -> None:
+        """转换任务结束后重置界面"""
+        if job is self._job:
+            self._job = None
+        self.reset_interface()
+        self.convert_btn.config(state=tk.NORMAL)
 
     def cancel_conversion(self) -> None:
+        job = self._job
+        if job is not None and job.name == "rename":
+            # 重命名任务在当前文件完成后停止，结束时由任务自身重置界面
+            job.cancel()
+            self.cancel_btn.config(state=tk.DISABLED)
+            self.progress_label.config(text="正在取消...")
+            return
+
         self.reset_interface()
+        self.convert_btn.config(state=tk.NORMAL)
         messagebox.showinfo("取消", "转换已取消")
 
     def reset_interface(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        self._preview_queue = None
         self.conversion_list = []
-        self.list_text.config(state=tk.NORMAL)
-        self.list_text.delete(1.0, tk.END)
-        self.list_text.config(state=tk.DISABLED)
+        self.preview_list.set_items(self.conversion_list)
+        self.preview_list.set_summary("")
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", value=0)
+        self.progress_label.config(text="")
         self.confirm_btn.config(state=tk.DISABLED)
         self.cancel_btn.config(state=tk.DISABLED)
 
@@ -440,6 +723,14 @@ class MainWindow:
 
     def _check_updates_in_background(self) -> None:
         """在后台线程检查GitHub最新版本"""
+        try:
+            import requests
+            from packaging import version
+        except ImportError as e:
+            self.root.after(0, lambda: messagebox.showerror("错误", f"检查更新失败: {str(e)}"))
+            self.root.after(0, self._reset_update_button)
+            return
+
         try:
             # 检查配置是否完整
             if not config.GITHUB_REPO or config.GITHUB_REPO == "username/repo":
@@ -468,6 +759,8 @@ class MainWindow:
 
     def show_update_dialog(self, latest_version: str, release_url: str) -> None:
         """显示更新提示对话框"""
+        import webbrowser
+
         current_version = config.__version__
         if messagebox.askyesno("发现更新", f"有新版本可用: v{latest_version}\n当前版本: v{current_version}\n是否前往下载页面?"):
             webbrowser.open(release_url)
@@ -0,0 +1,93 @@
+# tests/test_index.py
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cn2an import (
+    ScanIndex,
+    arabic_to_chinese,
+    iter_conversions,
+    preview_conversions,
+    process_files,
+)
+
+
+class ScanIndexTest(unittest.TestCase):
+    """扫描索引不应永久跳过未能重命名的文件"""
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.files = self.root / "files"
+        self.files.mkdir()
+        self.index_path = self.root / "index.db"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _process(self) -> None:
+        with ScanIndex(self.index_path) as index:
+            process_files(self.files, index=index)
+
+    def test_blocked_file_is_retried(self) -> None:
+        (self.files / "第一.txt").touch()
+        (self.files / "1.txt").touch()
+        self._process()
+        self.assertEqual(sorted(os.listdir(self.files)), ["1.txt", "第一.txt"])
+
+        # 冲突解除后，即使目录中又出现了其他新文件，也应重新处理
+        (self.files / "1.txt").unlink()
+        (self.files / "new.txt").touch()
+        self._process()
+        self.assertEqual(sorted(os.listdir(self.files)), ["1.txt", "new.txt"])
+
+    def test_early_stop_keeps_unconsumed_files(self) -> None:
+        for n in range(1, 11):
+            (self.files / f"第{arabic_to_chinese(n)}.txt").touch()
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                with ScanIndex(self.index_path) as index:
+                    conversions = iter_conversions(
+                        self.files, index=index, workers=workers
+                    )
+                    next(conversions)
+                    conversions.close()
+
+                with ScanIndex(self.index_path) as index:
+                    self.assertEqual(
+                        len(preview_conversions(self.files, index=index)), 10
+                    )
+                self.index_path.unlink()
+
+    def test_early_stop_in_subdirectories(self) -> None:
+        for d in range(5):
+            sub = self.files / f"d{d}"
+            sub.mkdir()
+            for n in range(1, 4):
+                (sub / f"第{arabic_to_chinese(n)}.txt").touch()
+        with ScanIndex(self.index_path) as index:
+            conversions = iter_conversions(
+                self.files, recursive=True, index=index, workers=4
+            )
+            next(conversions)
+            conversions.close()
+
+        with ScanIndex(self.index_path) as index:
+            self.assertEqual(
+                len(preview_conversions(self.files, recursive=True, index=index)), 15
+            )
+
+    def test_restored_file_is_reprocessed(self) -> None:
+        (self.files / "第二.txt").touch()
+        self._process()
+        self.assertEqual(os.listdir(self.files), ["2.txt"])
+
+        # 模拟撤销：恢复原名
+        (self.files / "2.txt").rename(self.files / "第二.txt")
+        self._process()
+        self.assertEqual(os.listdir(self.files), ["2.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
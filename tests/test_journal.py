@@ -0,0 +1,87 @@
+# tests/test_journal.py
+import os
+import tempfile
+import unittest
+
+from cn2an import RenameJournal, execute_plan, plan_conversions, resume_journal
+
+
+class ResumeJournalTest(unittest.TestCase):
+    """重命名全部完成、但完成记录未刷盘时中断，恢复不应再次执行已完成的操作"""
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.journal_path = os.path.join(self.root, "journal.jsonl")
+        self.files = os.path.join(self.root, "files")
+        os.mkdir(self.files)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, contents: dict) -> None:
+        for name, text in contents.items():
+            with open(os.path.join(self.files, name), "w", encoding="utf-8") as f:
+                f.write(text)
+
+    def _read(self) -> dict:
+        result = {}
+        for name in os.listdir(self.files):
+            with open(os.path.join(self.files, name), encoding="utf-8") as f:
+                result[name] = f.read()
+        return result
+
+    def _run_and_drop_done_records(self, renames: dict) -> None:
+        """执行计划，但只让计划写入日志（模拟完成记录的批次丢失）"""
+        entries = {entry.name: entry for entry in os.scandir(self.files)}
+        plan = plan_conversions(
+            [(entries[name], new_name) for name, new_name in renames.items()]
+        )
+        with RenameJournal(self.journal_path, fsync=False) as journal:
+            journal.record_plan(plan)
+        execute_plan(plan)
+
+    def test_resume_completed_chain(self) -> None:
+        self._write({"a": "orig-a", "b": "orig-b"})
+        self._run_and_drop_done_records({"a": "b", "b": "c"})
+        self.assertEqual(self._read(), {"b": "orig-a", "c": "orig-b"})
+
+        self.assertEqual(resume_journal(self.journal_path), 0)
+        self.assertEqual(self._read(), {"b": "orig-a", "c": "orig-b"})
+
+    def test_resume_completed_cycle(self) -> None:
+        self._write({"a": "orig-a", "b": "orig-b"})
+        self._run_and_drop_done_records({"a": "b", "b": "a"})
+        self.assertEqual(self._read(), {"a": "orig-b", "b": "orig-a"})
+
+        self.assertEqual(resume_journal(self.journal_path), 0)
+        self.assertEqual(self._read(), {"a": "orig-b", "b": "orig-a"})
+
+    def test_resume_interrupted_chain(self) -> None:
+        self._write({"a": "orig-a", "b": "orig-b"})
+        entries = {entry.name: entry for entry in os.scandir(self.files)}
+        plan = plan_conversions([(entries["a"], "b"), (entries["b"], "c")])
+        with RenameJournal(self.journal_path, fsync=False) as journal:
+            journal.record_plan(plan)
+        # 只完成链中的第一步（b -> c）后中断
+        (chain,) = plan.chains
+        os.rename(chain[0].source, chain[0].target)
+
+        self.assertEqual(resume_journal(self.journal_path), 1)
+        self.assertEqual(self._read(), {"b": "orig-a", "c": "orig-b"})
+
+    def test_resume_does_not_overwrite(self) -> None:
+        self._write({"a": "orig-a"})
+        entries = {entry.name: entry for entry in os.scandir(self.files)}
+        plan = plan_conversions([(entries["a"], "b")])
+        with RenameJournal(self.journal_path, fsync=False) as journal:
+            journal.record_plan(plan)
+        # 中断后目标名称被其他文件占用
+        self._write({"b": "other"})
+
+        self.assertEqual(resume_journal(self.journal_path), 0)
+        self.assertEqual(self._read(), {"a": "orig-a", "b": "other"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_roundtrip.py
+import random
+import unittest
+
+from cn2an import arabic_to_chinese, chinese_to_arabic
+
+
+class KnownCasesTest(unittest.TestCase):
+    """固定样例：标准写法及其数值"""
+
+    CASES = [
+        (0, "零"),
+        (10, "十"),
+        (15, "十五"),
+        (100000, "十万"),
+        (100000001, "一亿零一"),
+        (1000000000001, "一万亿零一"),
+        (10**16, "一亿亿"),
+        (-5, "负五"),
+        (-100010, "负十万零一十"),
+        (3.14, "三点一四"),
+        (-0.5, "负零点五"),
+        (1.05, "一点零五"),
+    ]
+
+    def test_arabic_to_chinese(self) -> None:
+        for number, text in self.CASES:
+            with self.subTest(number=number):
+                self.assertEqual(arabic_to_chinese(number), text)
+
+    def test_chinese_to_arabic(self) -> None:
+        for number, text in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(chinese_to_arabic(text), number)
+
+    def test_extended_grammar(self) -> None:
+        cases = {
+            "两万": 20000,
+            "壹佰零贰": 102,
+            "二〇二四": 2024,
+            "三万亿": 3 * 10**12,
+            "两万三千亿": 23000 * 10**8,
+            "负十": -10,
+            "零点零一": 0.01,
+        }
+        for text, number in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(chinese_to_arabic(text), number)
+
+    def test_invalid(self) -> None:
+        for text in ["", "点五", "五负", "三点十", "负", "abc"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    chinese_to_arabic(text)
+        for value in [True, "1", None, float("inf"), float("nan")]:
+            with self.subTest(value=value):
+                with self.assertRaises((TypeError, ValueError)):
+                    arabic_to_chinese(value)
+
+
+class RoundTripTest(unittest.TestCase):
+    """arabic_to_chinese与chinese_to_arabic互为逆操作"""
+
+    LIMIT = 10**12
+    SAMPLES = 20000
+
+    def assertRoundTrip(self, number: int) -> None:
+        text = arabic_to_chinese(number)
+        self.assertEqual(chinese_to_arabic(text), number, text)
+
+    def test_small_numbers(self) -> None:
+        for number in range(10000):
+            self.assertRoundTrip(number)
+
+    def test_sampled_numbers(self) -> None:
+        rng = random.Random(0)
+        digits = len(str(self.LIMIT - 1))
+        for _ in range(self.SAMPLES):
+            # 先随机选位数再随机取值，保证大数和小数都能被覆盖
+            value = rng.randrange(10 ** rng.randrange(1, digits + 1))
+            if rng.randrange(4) == 0:
+                # 随机清零一个四位小节，覆盖"零"的插入规则
+                power = 10 ** (4 * rng.randrange(digits // 4))
+                value -= value // power % 10000 * power
+            self.assertRoundTrip(-value if rng.randrange(8) == 0 else value)
+
+    def test_large_units(self) -> None:
+        for exponent in range(4, 24):
+            for number in (10**exponent, 10**exponent + 1, 3 * 10**exponent + 10**4):
+                self.assertRoundTrip(number)
+
+
+if __name__ == "__main__":
+    unittest.main()